@@ -2,23 +2,26 @@ from fastapi import APIRouter, HTTPException, Response, Depends
 
 from database import db_session_scope
 
-from database.models import Account
+from database.models import Account, User
 from database.schemas.account_schema import AccountMeSchemaGET, AccountSchemaGET
 from database.schemas.account_schema import AccountSchemaPOST
 from database.schemas.account_schema import AccountSchemaPUT
 from database.schemas.register_schema import RegisterUserSchema
 from core.services.queries_service.base_queries import BaseQueries
+from core.services.queries_service.load_profiles import load_options
 
 from core.services.auth_service.auth_queries_service import AuthQueries
+from core.services.auth_service.principal_cache import principal_cache
+from core.services.cache_service.query_cache import query_cache
 
 from core.services.auth_service.auth_config import (
     set_auth_cookie,
-    verify_password,
+    verify_password_async,
     create_access_token,
     get_current_account,
     COOKIE_NAME,
     needs_rehash,
-    hash_password,
+    hash_password_async,
 )
 from database.schemas.register_schema import RegisterCompanySchema
 
@@ -50,13 +53,9 @@ def read_user_me(response: Response, current_account: Account = Depends(get_curr
     company_data = None
 
     with db_session_scope(commit=False) as session:
-        from sqlalchemy.orm import joinedload
         account = (
             session.query(Account)
-            .options(
-                joinedload(Account.user),
-                joinedload(Account.admin_company)
-            )
+            .options(*load_options(Account, "account_me"))
             .filter(Account.id == current_account.id)
             .first()
         )
@@ -96,12 +95,12 @@ async def get_account_by_id(
 @router.post("/login/")
 async def login(credentials: AccountSchemaPOST, response: Response):
     account = auth_service.get_account_by_email(credentials.email)
-    if not account or not verify_password(credentials.password, account.password):
+    if not account or not await verify_password_async(credentials.password, account.password):
         raise HTTPException(
             status_code=401, detail="INCORRECT EMAIL OR PASSWORD")
 
     if needs_rehash(account.password):
-        new_hash = hash_password(credentials.password)
+        new_hash = await hash_password_async(credentials.password)
         auth_service.update_account_password_hash(account.id, new_hash)
 
     access_token = create_access_token(data={"sub": account.email})
@@ -121,7 +120,8 @@ async def logout(response: Response):
 
 @router.post("/register/company/", status_code=201)
 async def register_company(schema: RegisterCompanySchema):
-    created = auth_service.register_company(schema)
+    password_hash = await hash_password_async(schema.password)
+    created = auth_service.register_company(schema, password_hash)
     return {
         "msg": "Company account created successfully",
         "account_id": created["account_id"],
@@ -131,7 +131,8 @@ async def register_company(schema: RegisterCompanySchema):
 
 @router.post("/register/user/", status_code=201)
 async def register_user(schema: RegisterUserSchema):
-    created = auth_service.register_user(schema)
+    password_hash = await hash_password_async(schema.password)
+    created = auth_service.register_user(schema, password_hash)
     return {
         "msg": "User account created successfully",
         "account_id": created["account_id"],
@@ -148,6 +149,8 @@ async def edit_account(
     if current_account.id != schema.id:
         raise HTTPException(status_code=403, detail="FORBIDDEN")
 
+    new_hash = await hash_password_async(schema.password) if schema.password else None
+
     # Only allow email/password changes via this endpoint
     with db_session_scope(commit=True) as session:
         account = session.query(Account).filter(Account.id == schema.id).first()
@@ -157,13 +160,15 @@ async def edit_account(
         if schema.email:
             account.email = schema.email
 
-        if schema.password:
-            account.password = hash_password(schema.password)
+        if new_hash:
+            account.password = new_hash
 
         session.flush()
         session.refresh(account)
         session.expunge(account)
-        return account
+
+    principal_cache.invalidate_account(account.id)
+    return account
 
 
 @router.delete("/delete/", response_model=AccountSchemaGET)
@@ -182,4 +187,8 @@ async def delete_account(
         session.delete(account)
         session.flush()
         session.expunge(account)
-        return account
+
+    principal_cache.invalidate_account(account.id)
+    # Account.user cascades on delete
+    query_cache.invalidate_table(User)
+    return account
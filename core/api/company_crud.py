@@ -1,43 +1,74 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request
 from core.services.auth_service.auth_config import get_current_account
 from core.services.auth_service.company_access import assert_company_admin
+from core.services.auth_service.principal_cache import principal_cache
 from database import db_session_scope
-from database.models import Company, Account
+from database.models import Company, Account, Job
 from database.schemas.company_schema import CompanySchemaGET
 from database.schemas.company_schema import CompanySchemaPUT
 from core.services.queries_service.base_queries import BaseQueries
-from core.services.file_service.file_storage_service import ImageService
+from core.services.queries_service.pagination import PageParams, page_params, next_cursor_headers, ndjson_response
+from core.services.file_service.file_storage_service import ImageService, image_ids
+from core.services.file_service.image_variants import ImageVariant
 from core.services.recruiter_service.recruiter_service import RecruiterService
+from core.services.cache_service.query_cache import query_cache, model_tag, row_tags
+from core.services.http_service.conditional import conditional_json_response
+from core.services.http_service.fast_json import FastJSONResponse
 
 router = APIRouter(prefix="/company", tags=["Company"])
-service = BaseQueries(Company)
+service = BaseQueries(Company, cached=True, schema=CompanySchemaGET)
 image_service = ImageService(Company)
 recruiter_service = RecruiterService()
 
 
 @router.get("/", response_model=list[CompanySchemaGET])
-async def get_all_companies():
-    return service.get_all_with_relations()
+async def get_all_companies(request: Request, page: PageParams = Depends(page_params)):
+    if page.stream:
+        return ndjson_response(service.async_stream_all(sort=page.sort), CompanySchemaGET, trusted=True)
+
+    async def load():
+        companies, next_cursor = await service.async_get_page(page.limit, page.cursor, page.sort)
+        return companies, next_cursor_headers(next_cursor)
+
+    return await conditional_json_response(
+        request, ("company", "page", page.limit, page.cursor, page.sort), [model_tag(Company)],
+        list[CompanySchemaGET], load, trusted=True,
+    )
 
 
 @router.get("/profile/{id}/", response_model=CompanySchemaGET)
-async def get_company_by_id(id: int):
-    return service.get_by_id(id)
+async def get_company_by_id(request: Request, id: int):
+    async def load():
+        return await service.async_get_by_id(id), {}
+
+    return await conditional_json_response(
+        request, ("company", id), row_tags(Company, id), CompanySchemaGET, load, trusted=True
+    )
+
+
+@router.get("/images/", summary="Return images for many Companies", response_class=FastJSONResponse)
+async def get_object_images(ids: list[int] = Depends(image_ids), variant: ImageVariant | None = None):
+    return image_service.get_object_images(ids, variant)
 
 
 @router.get("/image/{object_id}/", summary="Return image for a Company")
-async def get_object_image(object_id: int,):
-    return image_service.get_object_image(object_id)
+async def get_object_image(object_id: int, variant: ImageVariant | None = None):
+    return image_service.get_object_image(object_id, variant)
+
 
+@router.get("/image/{object_id}/status/", summary="Return image upload status for a Company")
+async def get_object_image_status(object_id: int):
+    return image_service.get_object_image_status(object_id)
 
-@router.post("/image/{object_id}/", summary="Upload image for a Company")
+
+@router.post("/image/{object_id}/", summary="Upload image for a Company", status_code=202)
 async def upload_object_image(
     object_id: int,
     file: UploadFile = File(...),
     current_account: Account = Depends(get_current_account),
 ):
     assert_company_admin(current_account=current_account, company_id=object_id)
-    return image_service.upload_object_image(object_id, file)
+    return await image_service.upload_object_image(object_id, file)
 
 
 @router.put("/edit/")
@@ -57,7 +88,10 @@ async def edit_company(
         session.flush()
         session.refresh(company)
         session.expunge(company)
-        return company
+
+    principal_cache.invalidate_company_access(company_id=schema.id)
+    query_cache.invalidate_rows(Company, company.id)
+    return company
 
 
 @router.delete("/delete/")
@@ -66,7 +100,11 @@ async def delete_company(
     current_account: Account = Depends(get_current_account),
 ):
     assert_company_admin(current_account=current_account, company_id=id)
-    return service.delete_record(id)
+    deleted = service.delete_record(id)
+    principal_cache.invalidate_company_access(company_id=id)
+    # Company.jobs cascades on delete
+    query_cache.invalidate_table(Job)
+    return deleted
 
 
 @router.delete("/image/delete/{object_id}/", summary="Delete image for a Company")
@@ -75,7 +113,7 @@ async def delete_object_image(
     current_account: Account = Depends(get_current_account),
 ):
     assert_company_admin(current_account=current_account, company_id=object_id)
-    return image_service.delete_object_image(object_id)
+    return await image_service.delete_object_image(object_id)
 
 
 @router.get("/search-applicants")
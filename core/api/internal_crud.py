@@ -0,0 +1,64 @@
+import os
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+import database.database as database
+from core.security.hashing_executor import hashing_executor
+from core.services.auth_service.principal_cache import principal_cache
+from core.services.cache_service.query_cache import query_cache
+from core.services.rating_service.rating_buffer import rating_buffer
+from core.services.file_service.upload_worker import upload_worker
+from core.services.file_service.image_variants import variant_cache
+
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN")
+# Local development only: serve /internal/* and /metrics without a token
+INTERNAL_API_OPEN = os.getenv("INTERNAL_API_OPEN", "false").lower() == "true"
+
+
+def require_internal_token(x_internal_token: str | None = Header(None)):
+    if not INTERNAL_API_TOKEN:
+        if INTERNAL_API_OPEN:
+            return
+        raise HTTPException(status_code=403, detail="FORBIDDEN")
+    if not x_internal_token or not hmac.compare_digest(x_internal_token, INTERNAL_API_TOKEN):
+        raise HTTPException(status_code=403, detail="FORBIDDEN")
+
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_token)],
+)
+
+
+@router.get("/pool/", summary="Connection pool usage and checkout wait times")
+async def get_pool_metrics():
+    return database.get_pool_metrics()
+
+
+@router.get("/hashing/", summary="Password hashing pool saturation and hash/verify timings")
+async def get_hashing_metrics():
+    return hashing_executor.snapshot()
+
+
+@router.get("/cache/", summary="Hit/miss counters of the read-query and principal caches")
+async def get_cache_metrics():
+    return {
+        "query": query_cache.stats(),
+        "principal": principal_cache.stats(),
+    }
+
+
+@router.get("/ratings/", summary="Pending and flushed company rating aggregate deltas")
+async def get_rating_buffer_metrics():
+    return rating_buffer.snapshot()
+
+
+@router.get("/uploads/", summary="Background image upload pool and derived variant cache counters")
+async def get_upload_metrics():
+    return {
+        **upload_worker.snapshot(),
+        "variant_cache": variant_cache.stats(),
+    }
@@ -1,35 +1,97 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from typing import Annotated
+
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request, Body
 
 from database import db_session_scope
-from database.models import Job, Account
-from database.schemas.job_schema import JobSchemaGET, JobSchemaPOST, JobSchemaPUT
+from database.models import Job, Account, Company, Tag
+from database.schemas.job_schema import JobSchemaGET, JobDetailsSchemaGET, JobSchemaPOST, JobSchemaPUT, JobFacetsSchema
+from database.schemas.bulk_schema import BulkDeleteSchema, BulkResultSchema
 
 from core.services.auth_service.auth_config import get_current_account
 from core.services.auth_service.company_access import assert_company_access
-from core.services.queries_service.base_queries import BaseQueries
-from core.services.file_service.file_storage_service import ImageService
+from core.services.queries_service.job_queries import JobQueries
+from core.services.queries_service.job_filters import JobFilters, job_filters
+from core.services.queries_service.bulk import BULK_MAX_ITEMS, BulkResult
+from core.services.queries_service.pagination import PageParams, page_params, next_cursor_headers, ndjson_response
+from core.services.file_service.file_storage_service import ImageService, image_ids
+from core.services.file_service.image_variants import ImageVariant
+from core.services.cache_service.query_cache import query_cache, model_tag, row_tags
+from core.services.http_service.conditional import conditional_json_response
+from core.services.http_service.fast_json import FastJSONResponse
 
 
 router = APIRouter(prefix="/job", tags=["Job"])
 
 # Public read service
-service = BaseQueries(Job)
+service = JobQueries(Job, sortable=("id", "posting_date", "payoff"), cached=True, schema=JobSchemaGET)
 image_service = ImageService(Job)
+bulk_service = JobQueries(Job)
 
 
 @router.get("/", response_model=list[JobSchemaGET])
-async def get_all_jobs():
-    return service.get_all_with_relations()
+async def get_all_jobs(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    filters: JobFilters = Depends(job_filters),
+):
+    if page.stream:
+        return ndjson_response(
+            service.async_stream_all(sort=page.sort, filters=filters), JobSchemaGET, trusted=True
+        )
+
+    async def load():
+        jobs, next_cursor = await service.async_get_page(page.limit, page.cursor, page.sort, filters)
+        return jobs, next_cursor_headers(next_cursor)
+
+    return await conditional_json_response(
+        request, ("job", "page", page.limit, page.cursor, page.sort, filters), [model_tag(Job)],
+        list[JobSchemaGET], load, trusted=True,
+    )
+
+
+# Declared before "/{id}/" so "facets" is not parsed as a job id
+@router.get("/facets/", response_model=JobFacetsSchema, summary="Job counts per tag and company for a filter")
+async def get_job_facets(request: Request, filters: JobFilters = Depends(job_filters)):
+    async def load():
+        return await service.async_get_facets(filters), {}
+
+    return await conditional_json_response(
+        request, ("job", "facets", filters), [model_tag(Job), model_tag(Tag), model_tag(Company)],
+        JobFacetsSchema, load,
+    )
 
 
 @router.get("/{id}/", response_model=JobSchemaGET)
-async def get_job_by_id(id: int):
-    return service.get_by_id(id)
+async def get_job_by_id(request: Request, id: int):
+    async def load():
+        return await service.async_get_by_id(id), {}
+
+    return await conditional_json_response(request, ("job", id), row_tags(Job, id), JobSchemaGET, load, trusted=True)
+
+
+@router.get("/{id}/details/", response_model=JobDetailsSchemaGET, summary="Return a Job posting with its company and tags")
+async def get_job_details(id: int):
+    job = await service.async_get_by_id_with_relations(id, profile="job_with_company_and_tags")
+    return JobDetailsSchemaGET(
+        **JobSchemaGET.model_validate(job).model_dump(),
+        company=job.company,
+        tags=[entity_tag.tag for entity_tag in job.entity_tags],
+    )
+
+
+@router.get("/images", summary="Return images for many Job postings", response_class=FastJSONResponse)
+async def get_object_images(ids: list[int] = Depends(image_ids), variant: ImageVariant | None = None):
+    return image_service.get_object_images(ids, variant)
 
 
 @router.get("/image/{object_id}", summary="Return image for Job posting")
-async def get_object_image(object_id: int):
-    return image_service.get_object_image(object_id)
+async def get_object_image(object_id: int, variant: ImageVariant | None = None):
+    return image_service.get_object_image(object_id, variant)
+
+
+@router.get("/image/{object_id}/status", summary="Return image upload status for Job posting")
+async def get_object_image_status(object_id: int):
+    return image_service.get_object_image_status(object_id)
 
 
 # =====================
@@ -51,7 +113,9 @@ async def add_job(
         session.flush()
         session.refresh(new_job)
         session.expunge(new_job)
-        return new_job
+
+    query_cache.invalidate_model(Job)
+    return new_job
 
 
 @router.put("/edit/", response_model=JobSchemaGET)
@@ -77,7 +141,9 @@ async def edit_job(
         session.flush()
         session.refresh(job)
         session.expunge(job)
-        return job
+
+    query_cache.invalidate_rows(Job, job.id)
+    return job
 
 
 @router.delete("/delete/", response_model=JobSchemaGET)
@@ -94,10 +160,12 @@ async def delete_job(
         session.delete(job)
         session.flush()
         session.expunge(job)
-        return job
 
+    query_cache.invalidate_rows(Job, job.id)
+    return job
 
-@router.post("/image/{object_id}", summary="Upload image for Job posting")
+
+@router.post("/image/{object_id}", summary="Upload image for Job posting", status_code=202)
 async def upload_object_image(
     object_id: int,
     file: UploadFile = File(...),
@@ -110,7 +178,7 @@ async def upload_object_image(
             raise HTTPException(status_code=404, detail="JOB_NOT_FOUND")
         assert_company_access(current_account=current_account, company_id=job.company_id)
 
-    return image_service.upload_object_image(object_id, file)
+    return await image_service.upload_object_image(object_id, file)
 
 
 @router.delete("/image/delete/{object_id}")
@@ -124,4 +192,88 @@ async def delete_object_image(
             raise HTTPException(status_code=404, detail="JOB_NOT_FOUND")
         assert_company_access(current_account=current_account, company_id=job.company_id)
 
-    return image_service.delete_object_image(object_id)
+    return await image_service.delete_object_image(object_id)
+
+
+# =====================
+# Bulk routes: one access check per distinct company, per-item results
+# =====================
+
+
+def _denied_companies(current_account: Account, company_ids) -> dict[int, HTTPException]:
+    denied = {}
+    for company_id in set(company_ids):
+        try:
+            assert_company_access(current_account=current_account, company_id=company_id)
+        except HTTPException as e:
+            denied[company_id] = e
+    return denied
+
+
+@router.post("/bulk/add/", response_model=BulkResultSchema, summary="Create many job postings")
+async def bulk_add_jobs(
+    schemas: Annotated[list[JobSchemaPOST], Body(max_length=BULK_MAX_ITEMS)],
+    current_account: Account = Depends(get_current_account),
+):
+    result = BulkResult()
+    denied = _denied_companies(current_account, (schema.company_id for schema in schemas))
+
+    items = []
+    for index, schema in enumerate(schemas):
+        if schema.company_id in denied:
+            error = denied[schema.company_id]
+            result.error(index, error.status_code, error.detail)
+        else:
+            items.append((index, schema.model_dump()))
+
+    bulk_service.bulk_insert(items, result)
+    return result.to_dict()
+
+
+@router.put("/bulk/edit/", response_model=BulkResultSchema, summary="Partially update many job postings")
+async def bulk_edit_jobs(
+    schemas: Annotated[list[JobSchemaPUT], Body(max_length=BULK_MAX_ITEMS)],
+    current_account: Account = Depends(get_current_account),
+):
+    result = BulkResult()
+    company_ids = bulk_service.get_company_ids([schema.id for schema in schemas])
+    denied = _denied_companies(current_account, company_ids.values())
+
+    items = []
+    for index, schema in enumerate(schemas):
+        company_id = company_ids.get(schema.id)
+        if company_id is None:
+            result.error(index, 404, "JOB_NOT_FOUND", id=schema.id)
+        elif company_id in denied:
+            result.error(index, denied[company_id].status_code, denied[company_id].detail, id=schema.id)
+        else:
+            items.append((index, schema.model_dump(exclude_unset=True)))
+
+    bulk_service.bulk_update(items, result)
+    return result.to_dict()
+
+
+@router.post("/bulk/delete/", response_model=BulkResultSchema, summary="Delete many job postings")
+async def bulk_delete_jobs(
+    schema: BulkDeleteSchema,
+    current_account: Account = Depends(get_current_account),
+):
+    if len(schema.ids) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail="TOO_MANY_ITEMS")
+
+    result = BulkResult()
+    company_ids = bulk_service.get_company_ids(schema.ids)
+    denied = _denied_companies(current_account, company_ids.values())
+
+    items = []
+    for index, id in enumerate(schema.ids):
+        company_id = company_ids.get(id)
+        if company_id is None:
+            result.error(index, 404, "JOB_NOT_FOUND", id=id)
+        elif company_id in denied:
+            result.error(index, denied[company_id].status_code, denied[company_id].detail, id=id)
+        else:
+            items.append((index, id))
+
+    bulk_service.bulk_delete(items, result)
+    return result.to_dict()
@@ -0,0 +1,50 @@
+import os
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+
+from core.services.file_service.image_variants import VARIANT_CONTENT_TYPE, variant_cache
+from core.services.file_service.storage_backends import LocalBackend, get_storage_backend
+
+router = APIRouter(prefix="/media", tags=["Media"], include_in_schema=False)
+
+# Stored files are content-addressed, so a URL always names the same bytes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/{object_id:path}", summary="Serve an image stored by the local storage backend")
+async def get_media(request: Request, object_id: str):
+    backend = get_storage_backend()
+    if not isinstance(backend, LocalBackend):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    try:
+        path = backend.resolve(object_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    # The file name is the content hash (plus the variant name for variants)
+    etag = f'"{os.path.basename(path).rsplit(".", 1)[0]}"'
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": etag}
+
+    if not os.path.isfile(path):
+        # A variant that was not generated at upload time: derive it into the variant cache
+        original = backend.original_object_id(object_id)
+        if original is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        original_id, variant = original
+
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        try:
+            data = await run_in_threadpool(variant_cache.get, original_id, backend.resolve(original_id), variant)
+        except Exception:
+            raise HTTPException(status_code=404, detail="Not Found")
+        return Response(content=data, media_type=VARIANT_CONTENT_TYPE, headers=headers)
+
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    # FileResponse streams from disk (zero-copy via the ASGI pathsend extension where the server supports it)
+    return FileResponse(path, headers=headers)
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from core.api.internal_crud import require_internal_token
+from core.services.metrics_service.metrics import registry
+
+# Prometheus text exposition format
+METRICS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(
+    tags=["Internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_token)],
+)
+
+
+@router.get("/metrics", summary="Metrics in Prometheus text exposition format")
+async def get_metrics():
+    return PlainTextResponse(registry.render(), media_type=METRICS_MEDIA_TYPE)
@@ -1,13 +1,17 @@
 from fastapi import APIRouter, Query
-from core.services.queries_service.search_queries import SearchQueries
+from core.services.queries_service.search_queries import SearchQueries, DEFAULT_RESULTS_PER_CATEGORY
+from database.schemas.search_schema import SearchResultsSchema
 
 router = APIRouter(prefix="/search", tags=["Search"])
 service = SearchQueries()
 
 
-@router.get("/")
-async def get_search_results(q: str = Query(..., min_length=1)):
+@router.get("/", response_model=SearchResultsSchema)
+async def get_search_results(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(DEFAULT_RESULTS_PER_CATEGORY, ge=1, le=50),
+):
     """
     Endpoint, zwraca wyniki dla osób, ofert i firm.
     """
-    return service.global_search(q)
+    return await service.global_search(q, limit)
@@ -1,23 +1,43 @@
-from fastapi import APIRouter
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Request
 
 from database.models import Tag
 from database.schemas.tag_schema import TagSchemaGET
 from database.schemas.tag_schema import TagSchemaPOST
 from database.schemas.tag_schema import TagSchemaPUT
-from core.services.queries_service.base_queries import BaseQueries
+from database.schemas.bulk_schema import BulkDeleteSchema, BulkResultSchema
+from core.services.queries_service.tag_queries import TagQueries
+from core.services.queries_service.bulk import BULK_MAX_ITEMS, BulkResult
+from core.services.queries_service.pagination import PageParams, page_params, next_cursor_headers, ndjson_response
+from core.services.cache_service.query_cache import model_tag, row_tags
+from core.services.http_service.conditional import conditional_json_response
 
 router = APIRouter(prefix="/tags", tags=["Tags"])
-service = BaseQueries(Tag)
+service = TagQueries(Tag, cached=True, schema=TagSchemaGET)
 
 
 @router.get("/", response_model=list[TagSchemaGET])
-async def get_all_tags():
-    return service.get_all_with_relations()
+async def get_all_tags(request: Request, page: PageParams = Depends(page_params)):
+    if page.stream:
+        return ndjson_response(service.async_stream_all(sort=page.sort), TagSchemaGET, trusted=True)
+
+    async def load():
+        tags, next_cursor = await service.async_get_page(page.limit, page.cursor, page.sort)
+        return tags, next_cursor_headers(next_cursor)
+
+    return await conditional_json_response(
+        request, ("tag", "page", page.limit, page.cursor, page.sort), [model_tag(Tag)], list[TagSchemaGET], load,
+        trusted=True,
+    )
 
 
 @router.get("/{id}/", response_model=TagSchemaGET)
-async def get_tag_by_id(id: int):
-    return service.get_by_id(id)
+async def get_tag_by_id(request: Request, id: int):
+    async def load():
+        return await service.async_get_by_id(id), {}
+
+    return await conditional_json_response(request, ("tag", id), row_tags(Tag, id), TagSchemaGET, load, trusted=True)
 
 
 @router.post("/add/")
@@ -25,7 +45,7 @@ async def add_tag(schema: TagSchemaPOST):
     return service.post_record(schema)
 
 
-@router.put("/edit/")
+@router.put("/edit/", response_model=TagSchemaGET)
 async def edit_tag(schema: TagSchemaPUT):
     return service.update_record(schema)
 
@@ -33,3 +53,27 @@ async def edit_tag(schema: TagSchemaPUT):
 @router.delete("/delete/")
 async def delete_tag(id: int):
     return service.delete_record(id)
+
+
+@router.post("/bulk/add/", response_model=BulkResultSchema, summary="Create many tags")
+async def bulk_add_tags(schemas: Annotated[list[TagSchemaPOST], Body(max_length=BULK_MAX_ITEMS)]):
+    result = BulkResult()
+    service.bulk_insert([(index, schema.model_dump()) for index, schema in enumerate(schemas)], result)
+    return result.to_dict()
+
+
+@router.put("/bulk/edit/", response_model=BulkResultSchema, summary="Partially update many tags")
+async def bulk_edit_tags(schemas: Annotated[list[TagSchemaPUT], Body(max_length=BULK_MAX_ITEMS)]):
+    result = BulkResult()
+    service.bulk_update([(index, schema.model_dump(exclude_unset=True)) for index, schema in enumerate(schemas)], result)
+    return result.to_dict()
+
+
+@router.post("/bulk/delete/", response_model=BulkResultSchema, summary="Delete many tags")
+async def bulk_delete_tags(schema: BulkDeleteSchema):
+    if len(schema.ids) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail="TOO_MANY_ITEMS")
+
+    result = BulkResult()
+    service.bulk_delete(list(enumerate(schema.ids)), result)
+    return result.to_dict()
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Response
 
 from database import db_session_scope
 from database.models import User, Account
-from database.schemas.user_schema import UserSchemaGET, UserSchemaPUT
+from database.schemas.user_schema import UserSchemaGET, UserProfileSchemaGET, UserSchemaPUT
 
 from core.services.auth_service.auth_config import get_current_account
 from core.services.queries_service.base_queries import BaseQueries
-from core.services.file_service.file_storage_service import ImageService
+from core.services.queries_service.pagination import PageParams, page_params, set_next_cursor, ndjson_response
+from core.services.file_service.file_storage_service import ImageService, image_ids
+from core.services.file_service.image_variants import ImageVariant
+from core.services.http_service.fast_json import FastJSONResponse
+from core.services.cache_service.query_cache import query_cache
 
 
 router = APIRouter(prefix="/user", tags=["Users"])
@@ -20,11 +24,27 @@ def _assert_user_owner(current_account: Account, user: User) -> None:
 
 
 @router.get("/", response_model=list[UserSchemaGET])
-async def get_all_users(current_account: Account = Depends(get_current_account)):
+async def get_all_users(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_account: Account = Depends(get_current_account),
+):
     # Avoid user enumeration: admin-only
     if (current_account.type or "").lower() != "admin":
         raise HTTPException(status_code=403, detail="FORBIDDEN")
-    return service.get_all_with_relations()
+
+    if page.stream:
+        return ndjson_response(service.stream_all(sort=page.sort), UserSchemaGET)
+
+    users, next_cursor = service.get_page(page.limit, page.cursor, page.sort)
+    set_next_cursor(response, next_cursor)
+    return users
+
+
+# Declared before "/{id}/" so "images" is not parsed as a user id
+@router.get("/images/", summary="Return images for many Users", response_class=FastJSONResponse)
+async def get_object_images(ids: list[int] = Depends(image_ids), variant: ImageVariant | None = None):
+    return image_service.get_object_images(ids, variant)
 
 
 @router.get("/{id}/", response_model=UserSchemaGET)
@@ -35,12 +55,25 @@ async def get_user_by_id(id: int, current_account: Account = Depends(get_current
     return user
 
 
+@router.get("/{id}/profile/", response_model=UserProfileSchemaGET, summary="Return an User with experience, education and skills")
+async def get_user_profile(id: int, current_account: Account = Depends(get_current_account)):
+    user = service.get_by_id_with_relations(id, profile="user_with_profile")
+    if (current_account.type or "").lower() != "admin":
+        _assert_user_owner(current_account, user)
+    return user
+
+
 @router.get("/image/{object_id}/", summary="Return image for an User")
-async def get_object_image(object_id: int):
-    return image_service.get_object_image(object_id)
+async def get_object_image(object_id: int, variant: ImageVariant | None = None):
+    return image_service.get_object_image(object_id, variant)
+
 
+@router.get("/image/{object_id}/status/", summary="Return image upload status for an User")
+async def get_object_image_status(object_id: int):
+    return image_service.get_object_image_status(object_id)
 
-@router.post("/image/{object_id}/", summary="Upload image for an User")
+
+@router.post("/image/{object_id}/", summary="Upload image for an User", status_code=202)
 async def upload_object_image(
     object_id: int,
     file: UploadFile = File(...),
@@ -52,7 +85,7 @@ async def upload_object_image(
             raise HTTPException(status_code=404, detail="USER_NOT_FOUND")
         _assert_user_owner(current_account, user)
 
-    return image_service.upload_object_image(object_id, file)
+    return await image_service.upload_object_image(object_id, file)
 
 
 @router.put("/edit/", response_model=UserSchemaGET)
@@ -92,7 +125,9 @@ async def delete_user(
         session.delete(user)
         session.flush()
         session.expunge(user)
-        return user
+
+    query_cache.invalidate_rows(User, user.id)
+    return user
 
 
 @router.delete("/image/delete/{object_id}", summary="Delete image for an User")
@@ -106,4 +141,4 @@ async def delete_object_image(
             raise HTTPException(status_code=404, detail="USER_NOT_FOUND")
         _assert_user_owner(current_account, user)
 
-    return image_service.delete_object_image(object_id)
+    return await image_service.delete_object_image(object_id)
@@ -0,0 +1,114 @@
+"""Bounded worker pool for password hashing.
+
+Argon2id with 64 MiB memory cost takes ~100ms of CPU per call. Running it in
+`async def` handlers blocks the event loop, and an unbounded login burst can
+allocate 64 MiB per concurrent call. Here the work runs on a small thread pool
+(argon2-cffi releases the GIL, so threads hash in parallel) and the number of
+queued + running calls is capped; callers over the cap get 429.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from core.services.metrics_service.metrics import PASSWORD_HASHING_SECONDS
+
+HASHING_WORKERS = int(os.getenv("HASHING_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASHING_QUEUE_LIMIT = int(os.getenv("HASHING_QUEUE_LIMIT", "32"))
+
+
+class OperationTimings:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.seconds_total = 0.0
+        self.seconds_max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.seconds_total += seconds
+            if seconds > self.seconds_max:
+                self.seconds_max = seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "count": self.count,
+                "seconds_total": round(self.seconds_total, 6),
+                "seconds_avg": round(self.seconds_total / self.count, 6) if self.count else 0.0,
+                "seconds_max": round(self.seconds_max, 6),
+            }
+
+
+class HashingExecutor:
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.rejected = 0
+        self.timings = {"hash": OperationTimings(), "verify": OperationTimings()}
+
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="hashing"
+                    )
+        return self._executor
+
+    def _timed(self, operation: str, func, args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.timings[operation].observe(elapsed)
+            PASSWORD_HASHING_SECONDS.observe(elapsed, (operation,))
+
+    async def run(self, operation: str, func, *args):
+        """Run `func(*args)` on the pool or raise 429 when the queue is full."""
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail="TOO MANY REQUESTS",
+                headers={"Retry-After": "1"},
+            )
+
+        try:
+            future = self._get_executor().submit(self._timed, operation, func, args)
+        except Exception:
+            self._slots.release()
+            raise
+        # Released when the work finishes or is cancelled before it starts,
+        # never earlier, so an abandoned request still holds its slot while hashing.
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "rejected": self.rejected,
+            "hash": self.timings["hash"].snapshot(),
+            "verify": self.timings["verify"].snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hashing_executor = HashingExecutor(workers=HASHING_WORKERS, queue_limit=HASHING_QUEUE_LIMIT)
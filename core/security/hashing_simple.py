@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 
 from database.database import get_db
 from database.models import Account
+from core.security.hashing_executor import hashing_executor
 
 # -----------------------
 # JWT config (keep simple)
@@ -83,6 +84,15 @@ def verify_password(plain: str, hashed: str) -> bool:
         return False
 
 
+# Async variants for request handlers: run on the bounded hashing pool (429 when saturated)
+async def hash_password_async(plain: str) -> str:
+    return await hashing_executor.run("hash", hash_password, plain)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await hashing_executor.run("verify", verify_password, plain, hashed)
+
+
 def needs_rehash(hashed: str) -> bool:
     if not hashed:
         return False
@@ -7,10 +7,13 @@ from fastapi import Request, HTTPException, Depends, Response
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
 
-from database.database import get_db
+from database import db_session_scope
+from database import MissingDatabaseError
 from database.models import Account
+from core.services.auth_service.principal_cache import principal_cache
+from core.services.queries_service.load_profiles import load_options
+from core.security.hashing_executor import hashing_executor
 
 
 # JWT config
@@ -79,6 +82,15 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+# Async variants for request handlers: run on the bounded hashing pool (429 when saturated)
+async def hash_password_async(plain: str) -> str:
+    return await hashing_executor.run("hash", hash_password, plain)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_executor.run("verify", verify_password, plain_password, hashed_password)
+
+
 def needs_rehash(hashed_password: str) -> bool:
     if not hashed_password:
         return False
@@ -116,7 +128,6 @@ def set_auth_cookie(response: Response, access_token: str):
 def get_current_account(
     request: Request,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
 ):
     if not token:
         token = request.cookies.get(COOKIE_NAME)
@@ -132,8 +143,25 @@ def get_current_account(
     except JWTError:
         raise HTTPException(status_code=401, detail="TOKEN VERIFICATION ERROR")
 
-    account = db.query(Account).filter(Account.email == email).first()
+    account = principal_cache.get_account(email)
+    if account is not None:
+        return account
+
+    generation = principal_cache.generation()
+    try:
+        with db_session_scope(commit=False) as session:
+            # Cached and detached: load what authorization checks read (admin_company, company_recruiters)
+            account = (
+                session.query(Account)
+                .options(*load_options(Account, "account_with_companies"))
+                .filter(Account.email == email)
+                .first()
+            )
+    except MissingDatabaseError:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
     if account is None:
         raise HTTPException(status_code=401, detail="ACCOUNT NOT FOUND")
 
+    principal_cache.set_account(email, account, generation)
     return account
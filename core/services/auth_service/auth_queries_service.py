@@ -3,8 +3,8 @@ import logging
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 
-from core.services.auth_service.auth_config import get_password_hash
 from core.services.queries_service.base_queries import BaseQueries
+from core.services.cache_service.query_cache import query_cache
 
 from database.models import Account, Company, CompanyRecruiter, User
 from database import db_session_scope
@@ -39,7 +39,7 @@ class AuthQueries(BaseQueries):
             raise HTTPException(status_code=500, detail="Internal server error")
 
     # Company registration
-    def register_company(self, data):
+    def register_company(self, data, password_hash: str):
         try:
             with db_session_scope(commit=True) as session:
                 # Check email uniqueness
@@ -64,7 +64,7 @@ class AuthQueries(BaseQueries):
                 # Create Account
                 new_account = Account(
                     email=data.email,
-                    password=get_password_hash(data.password),
+                    password=password_hash,
                     type="admin"
                 )
                 session.add(new_account)
@@ -85,11 +85,13 @@ class AuthQueries(BaseQueries):
                     company_id=new_company.id
                 )
                 session.add(new_admin)
-
-                return {
+                created = {
                     "account_id": new_account.id,
                     "company_id": new_company.id
                 }
+
+            query_cache.invalidate_model(Company)
+            return created
         except IntegrityError:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT, detail="Unknown integrity error."
@@ -104,7 +106,7 @@ class AuthQueries(BaseQueries):
             raise HTTPException(status_code=500, detail="Internal server error")
 
     # Example User registration (not fully implemented)
-    def register_user(self, data):
+    def register_user(self, data, password_hash: str):
         try:
             with db_session_scope(commit=True) as session:
                 # Check email uniqueness
@@ -121,7 +123,7 @@ class AuthQueries(BaseQueries):
 
                 new_account = Account(
                     email=data.email,
-                    password=get_password_hash(data.password),
+                    password=password_hash,
                     type="applicant",
                 )
                 session.add(new_account)
@@ -7,6 +7,8 @@ Guardrails required:
 In this data model:
 - Company admin: Company.account_id == Account.id and Account.type == 'admin'
 - Company recruiter: CompanyRecruiter(account_id, company_id)
+
+Granted decisions are cached in `principal_cache`; denials are never cached.
 """
 
 from __future__ import annotations
@@ -15,6 +17,7 @@ from fastapi import HTTPException
 
 from database import db_session_scope
 from database.models import Account, Company, CompanyRecruiter
+from core.services.auth_service.principal_cache import principal_cache
 
 
 def assert_company_access(*, current_account: Account, company_id: int) -> Company:
@@ -22,7 +25,11 @@ def assert_company_access(*, current_account: Account, company_id: int) -> Compa
 
     Returns the Company (useful for downstream logic) or raises HTTPException.
     """
+    cached = principal_cache.get_company_access("access", current_account.id, company_id)
+    if cached is not None:
+        return cached
 
+    generation = principal_cache.generation()
     with db_session_scope(commit=False) as session:
         company = session.query(Company).filter(Company.id == company_id).first()
         if not company:
@@ -31,6 +38,7 @@ def assert_company_access(*, current_account: Account, company_id: int) -> Compa
         # 1) Company admin (single admin per company)
         if (current_account.type or "").lower() == "admin":
             if company.account_id and company.account_id == current_account.id:
+                principal_cache.set_company_access("access", current_account.id, company_id, company, generation)
                 return company
 
             raise HTTPException(status_code=403, detail="FORBIDDEN_COMPANY_MISMATCH")
@@ -45,6 +53,7 @@ def assert_company_access(*, current_account: Account, company_id: int) -> Compa
             .first()
         )
         if link:
+            principal_cache.set_company_access("access", current_account.id, company_id, company, generation)
             return company
 
     raise HTTPException(status_code=403, detail="FORBIDDEN")
@@ -52,7 +61,11 @@ def assert_company_access(*, current_account: Account, company_id: int) -> Compa
 
 def assert_company_admin(*, current_account: Account, company_id: int) -> Company:
     """Company admin only."""
+    cached = principal_cache.get_company_access("admin", current_account.id, company_id)
+    if cached is not None:
+        return cached
 
+    generation = principal_cache.generation()
     with db_session_scope(commit=False) as session:
         company = session.query(Company).filter(Company.id == company_id).first()
         if not company:
@@ -64,6 +77,7 @@ def assert_company_admin(*, current_account: Account, company_id: int) -> Compan
         if not company.account_id or company.account_id != current_account.id:
             raise HTTPException(status_code=403, detail="FORBIDDEN_COMPANY_MISMATCH")
 
+        principal_cache.set_company_access("admin", current_account.id, company_id, company, generation)
         return company
 
 
@@ -0,0 +1,124 @@
+"""Short-lived cache of authenticated principals.
+
+`get_current_account` runs on every authenticated request; with this cache a
+request costs a JWT verification plus a dict lookup instead of an account
+query. Company access decisions are cached the same way for
+`assert_company_access` / `assert_company_admin`.
+
+Entries are dropped explicitly when an account is edited/deleted or a recruiter
+assignment changes. Every invalidation also bumps a generation; a lookup
+captures it before its query and does not store its result if it changed, so a
+load that raced an invalidation cannot write the old account back. The cache
+is per process, so other workers may serve a stale entry for at most
+PRINCIPAL_CACHE_TTL_SECONDS.
+
+Each request gets its own detached copy of a cached entry, so a request that
+touches its Account or Company never changes what other requests see.
+"""
+
+import copy
+import os
+import threading
+
+from sqlalchemy import inspect
+from sqlalchemy.orm.attributes import set_committed_value
+
+from core.services.cache_service.ttl_cache import TTLCache
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+
+
+def _detached_copy(instance, copies: dict | None = None):
+    """Copy of a detached ORM instance with its loaded columns and relationships."""
+    if instance is None:
+        return None
+    copies = {} if copies is None else copies
+    if id(instance) in copies:
+        return copies[id(instance)]
+
+    state = inspect(instance)
+    clone = state.mapper.class_manager.new_instance()
+    # Same identity key and no session: detached, like the original
+    inspect(clone).key = state.key
+    copies[id(instance)] = clone
+
+    mapper = state.mapper
+    for key, value in state.dict.items():
+        if key not in mapper.attrs:
+            continue
+        relationship = mapper.relationships.get(key)
+        if relationship is None:
+            # JSON columns hold mutable dicts/lists
+            set_committed_value(clone, key, copy.deepcopy(value))
+        elif relationship.uselist:
+            set_committed_value(clone, key, [_detached_copy(item, copies) for item in value])
+        else:
+            set_committed_value(clone, key, _detached_copy(value, copies))
+    return clone
+
+
+class PrincipalCache:
+
+    def __init__(self, max_size: int, ttl: float):
+        # token subject (email) -> detached Account
+        self.accounts = TTLCache(max_size=max_size, ttl=ttl)
+        # (role, account_id, company_id) -> detached Company
+        self.company_access = TTLCache(max_size=max_size, ttl=ttl)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def generation(self) -> int:
+        """Capture before loading an entry; pass to set_* so a stale load is not stored."""
+        return self._generation
+
+    def _bump(self) -> None:
+        with self._lock:
+            self._generation += 1
+
+    # Accounts
+    def get_account(self, subject: str):
+        return _detached_copy(self.accounts.get(subject))
+
+    def set_account(self, subject: str, account, generation: int) -> None:
+        with self._lock:
+            if generation == self._generation:
+                self.accounts.set(subject, _detached_copy(account))
+
+    def invalidate_account(self, account_id: int) -> None:
+        self._bump()
+        self.accounts.invalidate_where(lambda subject, account: account.id == account_id)
+        self.invalidate_company_access(account_id=account_id)
+
+    # Company access decisions
+    def get_company_access(self, role: str, account_id: int, company_id: int):
+        return _detached_copy(self.company_access.get((role, account_id, company_id)))
+
+    def set_company_access(self, role: str, account_id: int, company_id: int, company, generation: int) -> None:
+        with self._lock:
+            if generation == self._generation:
+                self.company_access.set((role, account_id, company_id), _detached_copy(company))
+
+    def invalidate_company_access(self, account_id: int | None = None, company_id: int | None = None) -> None:
+        def matches(key, _company):
+            _, cached_account_id, cached_company_id = key
+            return (
+                (account_id is None or cached_account_id == account_id)
+                and (company_id is None or cached_company_id == company_id)
+            )
+
+        self._bump()
+        self.company_access.invalidate_where(matches)
+
+    def clear(self) -> None:
+        self.accounts.clear()
+        self.company_access.clear()
+
+    def stats(self) -> dict:
+        return {
+            "accounts": self.accounts.stats(),
+            "company_access": self.company_access.stats(),
+        }
+
+
+principal_cache = PrincipalCache(max_size=PRINCIPAL_CACHE_MAX_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
@@ -0,0 +1,189 @@
+"""In-process cache for read queries with tag-based invalidation.
+
+Every entry is stored with the tags it depends on: the table name for
+collection reads (lists, pages) and `row_tags` (`table:*` plus `table:id`) for
+single rows, so cascaded deletes can drop every row of a table. Writes bump the
+generation of the affected tags, which makes every dependent entry stale in
+O(1) without scanning the cache. Tag generations are captured *before* the
+loader runs, and a result whose tags were bumped while it loaded is not
+stored, so a write that commits while a read is in flight is never masked by
+that read storing its (older) result.
+
+Generations come from one counter and are never reused. A tag whose last bump
+is older than the entry TTL is forgotten: every live entry was stored after
+that bump, so none can depend on the old value, and the generation table stays
+proportional to the recent write volume.
+
+The cache is per process; other workers see a write after at most
+QUERY_CACHE_TTL_SECONDS.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from itertools import count
+from typing import Awaitable, Callable, Hashable, Iterable
+
+from core.services.cache_service.ttl_cache import TTLCache
+
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "30"))
+QUERY_CACHE_MAX_SIZE = int(os.getenv("QUERY_CACHE_MAX_SIZE", "5000"))
+
+_MISSING = object()
+# cached_many: the loader had no value for this id
+_ABSENT = object()
+
+
+def model_tag(model) -> str:
+    return model.__tablename__
+
+
+def row_tag(model, id) -> str:
+    return f"{model.__tablename__}:{id}"
+
+
+def table_tag(model) -> str:
+    return f"{model.__tablename__}:*"
+
+
+def row_tags(model, id) -> list[str]:
+    """Tags of a single-row entry: the row itself and every row of its table."""
+    return [table_tag(model), row_tag(model, id)]
+
+
+class QueryCache:
+
+    def __init__(self, max_size: int, ttl: float):
+        self._entries = TTLCache(max_size=max_size, ttl=ttl)
+        self._generations: dict[str, int] = {}
+        # tag -> monotonic time of its last bump, oldest first
+        self._bumped_at: OrderedDict[str, float] = OrderedDict()
+        self._counter = count(1)
+        self._lock = threading.Lock()
+        self.stale = 0
+        self.invalidations = 0
+
+    def _versions(self, tags: tuple[str, ...]) -> tuple[int, ...]:
+        generations = self._generations
+        return tuple(generations.get(tag, 0) for tag in tags)
+
+    def get(self, key: Hashable):
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return _MISSING
+
+        tags, versions, value = entry
+        if self._versions(tags) != versions:
+            self._entries.pop(key)
+            self.stale += 1
+            return _MISSING
+        return value
+
+    def _store(self, key: Hashable, tags: tuple[str, ...], versions: tuple[int, ...], value) -> None:
+        # A tag bumped while the loader ran: the value may predate that write
+        if self._versions(tags) == versions:
+            self._entries.set(key, (tags, versions, value))
+
+    def cached(self, key: Hashable, tags: Iterable[str], loader: Callable):
+        value = self.get(key)
+        # An id cached_many found absent: let the loader decide (e.g. raise 404)
+        if value is not _MISSING and value is not _ABSENT:
+            return value
+
+        tags = tuple(tags)
+        versions = self._versions(tags)
+        value = loader()
+        self._store(key, tags, versions, value)
+        return value
+
+    async def cached_async(self, key: Hashable, tags: Iterable[str], loader: Callable[[], Awaitable]):
+        value = self.get(key)
+        # An id cached_many found absent: let the loader decide (e.g. raise 404)
+        if value is not _MISSING and value is not _ABSENT:
+            return value
+
+        tags = tuple(tags)
+        versions = self._versions(tags)
+        value = await loader()
+        self._store(key, tags, versions, value)
+        return value
+
+    def cached_many(
+        self,
+        keys: dict[Hashable, Hashable],
+        tags: Callable[[Hashable], Iterable[str]],
+        loader: Callable[[list], dict],
+    ) -> dict:
+        """Batch form of `cached`: `keys` maps ids to cache keys, `loader` gets only the missed ids.
+
+        Ids the loader leaves out of its result are left out of the returned dict and
+        cached as absent, so repeated lookups of unknown ids do not reach the loader.
+        """
+        found = {}
+        missed = {}
+        for id, key in keys.items():
+            value = self.get(key)
+            if value is _MISSING:
+                missed[id] = (key, tuple(tags(id)))
+            elif value is not _ABSENT:
+                found[id] = value
+
+        if missed:
+            versions = {id: self._versions(id_tags) for id, (_, id_tags) in missed.items()}
+            loaded = loader(list(missed))
+            for id, (key, id_tags) in missed.items():
+                value = loaded.get(id, _ABSENT)
+                self._store(key, id_tags, versions[id], value)
+                if value is not _ABSENT:
+                    found[id] = value
+
+        return found
+
+    def invalidate(self, *tags: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = next(self._counter)
+                self._bumped_at[tag] = now
+                self._bumped_at.move_to_end(tag)
+            self.invalidations += len(tags)
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """Forget tags not bumped within the entry TTL (no live entry can depend on them)."""
+        cutoff = now - self._entries.ttl
+        bumped_at = self._bumped_at
+        while bumped_at:
+            tag, at = next(iter(bumped_at.items()))
+            if at > cutoff:
+                break
+            del bumped_at[tag]
+            del self._generations[tag]
+
+    def invalidate_model(self, model) -> None:
+        self.invalidate(model_tag(model))
+
+    def invalidate_rows(self, model, *ids) -> None:
+        """A row changed: drop it and every collection read of its table."""
+        self.invalidate(model_tag(model), *(row_tag(model, id) for id in ids))
+
+    def invalidate_table(self, model) -> None:
+        """Rows changed without known ids (cascaded deletes): drop every entry of the table."""
+        self.invalidate(model_tag(model), table_tag(model))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        stats = self._entries.stats()
+        # Stale entries were counted as hits by the underlying LRU but were reloaded
+        stats["hits"] -= self.stale
+        stats["misses"] += self.stale
+        stats["stale"] = self.stale
+        stats["invalidations"] = self.invalidations
+        stats["tracked_tags"] = len(self._generations)
+        return stats
+
+
+query_cache = QueryCache(max_size=QUERY_CACHE_MAX_SIZE, ttl=QUERY_CACHE_TTL_SECONDS)
@@ -0,0 +1,130 @@
+"""Benchmark of the JSON response paths for list endpoints.
+
+    python -m core.services.debug_service.json_benchmark                   # serializers only, no database
+    python -m core.services.debug_service.json_benchmark --rows 1000
+    python -m core.services.debug_service.json_benchmark --http /job/?limit=100 --requests 300
+
+The serializer mode encodes synthetic projected job rows three ways:
+
+- `response_model`: FastAPI's default (validate, dump to Python objects, stdlib json),
+- `validated`: `render_json` (TypeAdapter validate + pydantic-core dump_json),
+- `trusted`: `render_json(trusted=True)` (fast_json, no per-row validation).
+
+`--http` measures requests/sec of a read endpoint through the ASGI app in this
+process with FAST_JSON_ENABLED off and on. The query cache is cleared before
+every request so each one loads and renders; it needs a reachable database.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from pydantic import TypeAdapter
+
+from database.schemas.job_schema import JobSchemaGET
+from core.services.http_service import fast_json
+from core.services.http_service.conditional import render_json
+
+_JobRow = namedtuple("_JobRow", list(JobSchemaGET.model_fields))
+
+
+def synthetic_rows(count: int) -> list:
+    posted = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        _JobRow(
+            id=i,
+            company_id=i % 50 + 1,
+            title=f"Backend developer {i}",
+            payoff=12000.0 + i,
+            description="Python, FastAPI, PostgreSQL. " * 20,
+            posting_date=posted + timedelta(minutes=i),
+            expiry_date=None,
+            posting_img_id=None,
+            posting_img_link=f"https://example.com/job/{i}.png",
+            posting_img_status="ready",
+        )
+        for i in range(count)
+    ]
+
+
+def _response_model_path(rows: list) -> bytes:
+    adapter = TypeAdapter(list[JobSchemaGET])
+    content = adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+    # Same settings as starlette's JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def bench_serializers(row_count: int, seconds: float = 1.0) -> dict:
+    """Encodes/sec of `row_count` rows for each path."""
+    rows = synthetic_rows(row_count)
+    paths = {
+        "response_model": lambda: _response_model_path(rows),
+        "validated": lambda: render_json(list[JobSchemaGET], rows),
+        "trusted": lambda: render_json(list[JobSchemaGET], rows, trusted=True),
+    }
+
+    results = {}
+    for name, encode in paths.items():
+        encode()
+        runs = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            encode()
+            runs += 1
+        results[name] = runs / (time.perf_counter() - started)
+    return results
+
+
+async def _bench_http(path: str, requests: int) -> dict:
+    import httpx
+
+    import main
+    from core.services.cache_service.query_cache import query_cache
+
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    # One event loop for both runs: pooled asyncpg connections are bound to it
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, fast in (("validated", False), ("trusted", True)):
+            fast_json.FAST_JSON_ENABLED = fast and fast_json.orjson is not None
+            (await client.get(path)).raise_for_status()
+            started = time.perf_counter()
+            for _ in range(requests):
+                query_cache.clear()
+                (await client.get(path)).raise_for_status()
+            results[name] = requests / (time.perf_counter() - started)
+    return results
+
+
+def bench_http(path: str, requests: int) -> dict:
+    enabled = fast_json.FAST_JSON_ENABLED
+    try:
+        return asyncio.run(_bench_http(path, requests))
+    finally:
+        fast_json.FAST_JSON_ENABLED = enabled
+
+
+def _print(results: dict, unit: str) -> None:
+    baseline = next(iter(results.values()))
+    for name, rate in results.items():
+        print(f"{name:>16}  {rate:10.1f} {unit}  x{rate / baseline:.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="rows per encoded list (serializer mode)")
+    parser.add_argument("--http", metavar="PATH", help="benchmark this GET endpoint instead")
+    parser.add_argument("--requests", type=int, default=200, help="requests per run (--http)")
+    args = parser.parse_args()
+
+    if args.http:
+        _print(bench_http(args.http, args.requests), "req/s")
+    else:
+        _print(bench_serializers(args.rows), f"lists of {args.rows}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Statement budgets for read routes.
+
+    python -m core.services.debug_service.query_budgets
+    python -m core.services.debug_service.query_budgets --email admin@example.com --password secret
+
+Every route is requested once through the ASGI app with the query and principal
+caches cleared, inside `assert_max_queries`. A relationship that its load
+profile does not cover (one lazy load per row) or a dropped profile makes the
+route exceed its budget, and the statements it ran are listed. With credentials,
+the authenticated routes for that account type are checked too.
+
+Needs a reachable database with some data; routes whose ids cannot be resolved
+from it are skipped. Exits with status 1 when a route is over budget.
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+
+from core.services.debug_service.query_counter import QueryBudgetExceeded, assert_max_queries
+
+
+@dataclass(frozen=True)
+class RouteBudget:
+    path: str
+    max_queries: int
+    # Account type the route needs (None: public)
+    account_type: str | None = None
+
+
+# Authenticated routes include the principal lookup (account_with_companies: 2 statements)
+ROUTE_BUDGETS = (
+    RouteBudget("/job/?limit=50", 1),
+    RouteBudget("/job/{job_id}/", 1),
+    RouteBudget("/job/{job_id}/details/", 2),
+    RouteBudget("/job/facets/", 1),
+    RouteBudget("/company/?limit=50", 1),
+    RouteBudget("/company/profile/{company_id}/", 1),
+    RouteBudget("/tags/?limit=50", 1),
+    RouteBudget("/account/me/", 3, "any"),
+    RouteBudget("/user/{user_id}/profile/", 6, "applicant"),
+    RouteBudget("/company/{own_company_id}/recruiters/", 4, "admin"),
+)
+
+
+def _first_id(client, path: str) -> int | None:
+    response = client.get(path)
+    rows = response.json() if response.status_code == 200 else []
+    return rows[0]["id"] if rows else None
+
+
+def _resolve_ids(client, me: dict | None) -> dict:
+    ids = {
+        "job_id": _first_id(client, "/job/?limit=1"),
+        "company_id": _first_id(client, "/company/?limit=1"),
+    }
+    if me:
+        ids["user_id"] = (me.get("user") or {}).get("id")
+        ids["own_company_id"] = (me.get("company") or {}).get("id")
+    return {key: value for key, value in ids.items() if value is not None}
+
+
+def _applies(budget: RouteBudget, account_type: str | None) -> bool:
+    if budget.account_type is None:
+        return True
+    if account_type is None:
+        return False
+    return budget.account_type in ("any", account_type)
+
+
+def check_budgets(client, account_type: str | None, ids: dict) -> list[tuple[RouteBudget, str, int | None, str]]:
+    """(budget, path, statements, outcome) per route; outcome is ok / over budget / skipped / HTTP status."""
+    from core.services.auth_service.principal_cache import principal_cache
+    from core.services.cache_service.query_cache import query_cache
+
+    results = []
+    for budget in ROUTE_BUDGETS:
+        if not _applies(budget, account_type):
+            continue
+        try:
+            path = budget.path.format(**ids)
+        except KeyError:
+            results.append((budget, budget.path, None, "skipped"))
+            continue
+
+        query_cache.clear()
+        principal_cache.clear()
+        try:
+            with assert_max_queries(budget.max_queries) as log:
+                response = client.get(path)
+        except QueryBudgetExceeded as e:
+            results.append((budget, path, log.count, f"over budget\n{e}"))
+            continue
+
+        outcome = "ok" if response.status_code == 200 else f"HTTP {response.status_code}"
+        results.append((budget, path, log.count, outcome))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--email", help="account to check the authenticated routes with")
+    parser.add_argument("--password")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    import main as app_main
+
+    with TestClient(app_main.app) as client:
+        me = None
+        if args.email:
+            login = client.post("/account/login/", json={"email": args.email, "password": args.password})
+            if login.status_code != 200:
+                sys.exit(f"Login failed: HTTP {login.status_code}")
+            me = client.get("/account/me/").json()
+
+        results = check_budgets(client, me and me.get("account_type"), _resolve_ids(client, me))
+
+    failed = False
+    for budget, path, count, outcome in results:
+        statements = "-" if count is None else count
+        print(f"{path:<40} {statements!s:>4} / {budget.max_queries:<3} {outcome}")
+        failed = failed or outcome.startswith("over budget") or outcome.startswith("HTTP")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
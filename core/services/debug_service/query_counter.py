@@ -0,0 +1,65 @@
+"""Count SQL statements issued while a block runs.
+
+Used to keep an eye on N+1 queries: wrap a request (e.g. through TestClient)
+and check that a route stays within its statement budget.
+
+    with assert_max_queries(3):
+        client.get("/account/me/")
+"""
+
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryLog:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def record(self, statement: str) -> None:
+        with self._lock:
+            self.statements.append(statement)
+
+
+def _default_engines() -> tuple:
+    from database.database import engine, async_engine
+    return engine, async_engine.sync_engine
+
+
+@contextmanager
+def count_queries(*engines):
+    """Yield a QueryLog of every statement run on `engines` (default: the app's sync + async engines)."""
+    engines = engines or _default_engines()
+    log = QueryLog()
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        log.record(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield log
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, *engines):
+    """Raise QueryBudgetExceeded if the block runs more than `max_queries` statements."""
+    with count_queries(*engines) as log:
+        yield log
+    if log.count > max_queries:
+        listing = "\n".join(f"  {i}. {statement}" for i, statement in enumerate(log.statements, 1))
+        raise QueryBudgetExceeded(f"Expected at most {max_queries} queries, got {log.count}:\n{listing}")
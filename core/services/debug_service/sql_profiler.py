@@ -0,0 +1,137 @@
+"""Per-request SQL profiling and slow-query log.
+
+Cursor events on the engines time every statement and add it to the stats of
+the request being served (held in a contextvar set by `SQLProfilingMiddleware`).
+Sync endpoints run in a worker thread with a copy of the request context, so
+they see, and update, the same stats object.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are logged with normalized SQL
+(whitespace collapsed, literals replaced by `?`), and every response gets a
+`Server-Timing` header with the request's statement count, DB time and total time.
+
+Off by default; set SQL_PROFILING_ENABLED=true in development.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from core.services.metrics_service.metrics import DB_QUERY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+SQL_PROFILING_ENABLED = os.getenv("SQL_PROFILING_ENABLED", "false").strip().lower() in ("1", "true", "yes", "on")
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_BIND_PARAM = re.compile(r"%\(\w+\)s|\$\d+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse a statement into a stable shape so equal queries group together in logs."""
+    statement = _BIND_PARAM.sub("?", statement)
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(?...)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+class RequestStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.started = time.perf_counter()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.statements += 1
+            self.db_seconds += seconds
+
+    def server_timing(self) -> str:
+        total_ms = (time.perf_counter() - self.started) * 1000
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.statements} queries", '
+            f"total;dur={total_ms:.1f}"
+        )
+
+
+_current_stats: ContextVar[RequestStats | None] = ContextVar("sql_request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    return _current_stats.get()
+
+
+class SQLProfiler:
+
+    def __init__(self, slow_query_threshold_ms: float):
+        self.slow_query_threshold = slow_query_threshold_ms / 1000
+
+    def instrument(self, engine) -> None:
+        """Hook the cursor events of a (sync) Engine; pass `async_engine.sync_engine` for async ones."""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["query_started"].pop()
+            self.observe(statement, elapsed)
+
+        @event.listens_for(engine, "handle_error")
+        def _on_error(context):
+            started = context.connection.info.get("query_started") if context.connection is not None else None
+            if started:
+                started.pop()
+
+    def observe(self, statement: str, elapsed: float) -> None:
+        DB_QUERY_SECONDS.observe(elapsed)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.observe(elapsed)
+        if elapsed >= self.slow_query_threshold:
+            logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {normalize_sql(statement)}")
+
+
+class SQLProfilingMiddleware:
+    """Pure ASGI middleware: opens per-request SQL stats and adds `Server-Timing`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            logger.debug(
+                f"{scope['method']} {scope['path']}: {stats.statements} queries, "
+                f"{stats.db_seconds * 1000:.1f} ms in DB"
+            )
+
+
+sql_profiler = SQLProfiler(slow_query_threshold_ms=SLOW_QUERY_THRESHOLD_MS)
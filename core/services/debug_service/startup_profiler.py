@@ -0,0 +1,91 @@
+"""Startup profiling and cold-start benchmark.
+
+Every measurement runs in a fresh interpreter, so nothing is already imported:
+
+    python -m core.services.debug_service.startup_profiler             # import-time breakdown
+    python -m core.services.debug_service.startup_profiler --bench 10  # cold start benchmark
+    python -m core.services.debug_service.startup_profiler --bench 10 --lifespan
+
+`--lifespan` also runs the application startup (database checks, background
+threads) and shutdown, so it needs a reachable database.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Runs in the child interpreter; prints timings as JSON on the last line
+_BENCH_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+if {lifespan}:
+    from fastapi.testclient import TestClient
+    with TestClient(main.app):
+        ready = time.perf_counter()
+else:
+    ready = imported
+print(json.dumps({{"import_ms": (imported - started) * 1000, "startup_ms": (ready - imported) * 1000}}))
+"""
+
+
+def import_breakdown(module: str = "main", top: int = 25) -> list[tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) of the slowest imports of `module`, by cumulative time."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows[:top]
+
+
+def benchmark(runs: int, lifespan: bool = False) -> dict:
+    """Cold-start `main` `runs` times; returns median/min/max of import and startup time in ms."""
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _BENCH_SCRIPT.format(lifespan=lifespan)],
+            capture_output=True, text=True, check=True,
+        )
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    summary = {}
+    for key in ("import_ms", "startup_ms"):
+        values = [sample[key] for sample in samples]
+        summary[key] = {
+            "median": round(statistics.median(values), 1),
+            "min": round(min(values), 1),
+            "max": round(max(values), 1),
+        }
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--top", type=int, default=25, help="number of imports to list")
+    parser.add_argument("--bench", type=int, metavar="RUNS", help="run the cold start benchmark RUNS times")
+    parser.add_argument("--lifespan", action="store_true", help="include application startup/shutdown")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        print(json.dumps(benchmark(args.bench, args.lifespan), indent=2))
+        return 0
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in import_breakdown(args.module, args.top):
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
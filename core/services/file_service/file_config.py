@@ -1,30 +1,44 @@
 import os
-import cloudinary
-
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True
-)
+from functools import cache
 
 OBJECT_CONFIG = {
     "user": {
         "model": "User",
         "folder": "user_prof_img",
         "column": "profile_img_link",
-        "img_id": "profile_img_id"
+        "img_id": "profile_img_id",
+        "status": "profile_img_status"
     },
     "company": {
         "model": "Company",
         "folder": "company_prof_img",
         "column": "profile_img_link",
-        "img_id": "profile_img_id"
+        "img_id": "profile_img_id",
+        "status": "profile_img_status"
     },
     "job": {
         "model": "Job",
         "folder": "job_posting_img",
         "column": "posting_img_link",
-        "img_id": "posting_img_id"
+        "img_id": "posting_img_id",
+        "status": "posting_img_status"
     },
 }
+
+# Same entries keyed by model class name, for ImageService lookups
+OBJECT_CONFIG_BY_MODEL = {cfg["model"]: cfg for cfg in OBJECT_CONFIG.values()}
+
+
+@cache
+def cloudinary_uploader():
+    """Import and configure the Cloudinary SDK on first use instead of at app import."""
+    import cloudinary
+    import cloudinary.uploader
+
+    cloudinary.config(
+        cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+        api_key=os.getenv("CLOUDINARY_API_KEY"),
+        api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+        secure=True
+    )
+    return cloudinary.uploader
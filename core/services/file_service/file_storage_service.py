@@ -1,13 +1,31 @@
 import logging
-from fastapi import HTTPException, UploadFile, File
+import os
+from fastapi import HTTPException, UploadFile, File, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
 from sqlalchemy.sql import exists
 from database import db_session_scope
-from core.services.file_service.file_config import OBJECT_CONFIG
-from cloudinary.uploader import upload
-from cloudinary.uploader import destroy
+from core.services.cache_service.query_cache import query_cache, row_tags
+from core.services.file_service.file_config import OBJECT_CONFIG_BY_MODEL
+from core.services.file_service.storage_backends import get_storage_backend
+from core.services.file_service.upload_worker import STATUS_PENDING, UploadJob, upload_worker
 
 logger = logging.getLogger(__name__)
 
+IMAGE_BATCH_MAX_IDS = int(os.getenv("IMAGE_BATCH_MAX_IDS", "100"))
+
+
+def image_ids(ids: list[str] = Query(..., description="Object ids, repeated or comma-separated")) -> list[int]:
+    """Parse `?ids=1,2,3` / `?ids=1&ids=2` for the batch image link routes."""
+    try:
+        parsed = list(dict.fromkeys(int(id) for value in ids for id in value.split(",") if id.strip()))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="INVALID_IDS")
+
+    if len(parsed) > IMAGE_BATCH_MAX_IDS:
+        raise HTTPException(status_code=413, detail="TOO_MANY_ITEMS")
+    return parsed
+
 
 class ImageService:
 
@@ -16,14 +34,7 @@ class ImageService:
         self.config = self._resolve_config()
 
     def _resolve_config(self):
-        print(f"DEBUG: Próba rozpoznania modelu: {self.model}")
-        config = next(
-            (
-                cfg for cfg in OBJECT_CONFIG.values()
-                if cfg["model"] == self.model.__name__
-            ),
-            None
-        )
+        config = OBJECT_CONFIG_BY_MODEL.get(self.model.__name__)
 
         if not config:
             raise HTTPException(
@@ -39,91 +50,159 @@ class ImageService:
                 exists().where(model.id == object_id)
             ).scalar()
 
-    def upload_object_image(self, object_id: int, file: UploadFile = File(...)):
+    async def upload_object_image(self, object_id: int, file: UploadFile = File(...)):
+        """Spool the file and queue it for upload; the row's status is "pending" until a worker finishes."""
         if not file.content_type or not file.content_type.startswith("image/"):
             raise HTTPException(
                 status_code=500,
                 detail="Only image files are allowed on this endpoint"
             )
 
-        if self.record_exists(self.model, object_id):
-
-            try:
-                result = upload(
-                    file.file,
-                    folder=self.config["folder"],
-                    resource_type="image"
-                )
-
-                with db_session_scope(commit=True) as session:
-                    column = getattr(self.model, self.config["column"])
-                    column_id = getattr(self.model, self.config["img_id"])
-
-                    session.query(self.model).filter(
-                        self.model.id == object_id
-                    ).update(
-                        {column: result["secure_url"],
-                         column_id: result["public_id"]}
-                    )
-
-                return {
-                    "url": result["secure_url"]
-                }
-
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Image upload failed: {str(e)}"
-                )
-        else:
+        upload_worker.reserve()
+        path = None
+        try:
+            path = await run_in_threadpool(upload_worker.spool, file.file)
+            marked = self._set_status(object_id, STATUS_PENDING)
+        except Exception as e:
+            upload_worker.release()
+            if path:
+                os.remove(path)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Image upload failed: {str(e)}"
+            )
+
+        if not marked:
+            upload_worker.release()
+            os.remove(path)
             raise HTTPException(
                 status_code=404,
                 detail="No record found based on data provided!")
 
-    def get_object_image(self, object_id: int):
-
-        mapped_column = self.config["column"]
+        upload_worker.submit(UploadJob(
+            model=self.model,
+            object_id=object_id,
+            config=self.config,
+            path=path,
+            content_type=file.content_type,
+        ))
+        return {
+            "object_id": object_id,
+            "status": STATUS_PENDING
+        }
+
+    def _set_status(self, object_id: int, status: str) -> bool:
+        with db_session_scope(commit=True) as session:
+            updated = session.execute(
+                update(self.model)
+                .where(self.model.id == object_id)
+                .values({self.config["status"]: status})
+                .returning(self.model.id)
+            ).first()
+        query_cache.invalidate_rows(self.model, object_id)
+        return updated is not None
 
+    def get_object_image_status(self, object_id: int):
         with db_session_scope(commit=False) as session:
-            obj = session.query(self.model).filter(
-                self.model.id == object_id
-            ).first()
+            row = session.query(
+                getattr(self.model, self.config["status"]),
+                getattr(self.model, self.config["column"]),
+            ).filter(self.model.id == object_id).first()
 
-        if not obj:
+        if row is None:
             raise HTTPException(
                 status_code=404,
                 detail="Record not found"
             )
 
-        return getattr(obj, mapped_column)
+        status, url = row
+        return {
+            "status": status,
+            "url": url
+        }
+
+    def get_object_image(self, object_id: int, variant: str | None = None):
+        """Return the image link, or the link of one of its resized variants."""
+        return query_cache.cached(
+            ("image", self.model.__tablename__, object_id, variant),
+            row_tags(self.model, object_id),
+            lambda: self._load_object_image(object_id, variant),
+        )
+
+    def get_object_images(self, object_ids: list[int], variant: str | None = None) -> dict[int, str | None]:
+        """Links for many objects; ids without a row are left out. Cached per object."""
+        return query_cache.cached_many(
+            {object_id: ("image", self.model.__tablename__, object_id, variant) for object_id in object_ids},
+            lambda object_id: row_tags(self.model, object_id),
+            lambda missed: self._load_object_images(missed, variant),
+        )
+
+    def _load_object_image(self, object_id: int, variant: str | None = None):
+        links = self._load_object_images([object_id], variant)
 
-    def delete_from_cloudinary(self, public_id: str):
-        result = destroy(public_id)
+        if object_id not in links:
+            raise HTTPException(
+                status_code=404,
+                detail="Record not found"
+            )
 
-        if result.get("result") != "ok":
-            raise RuntimeError("Failed to delete image from Cloudinary")
+        return links[object_id]
 
-    def delete_object_image(self, object_id: int):
+    def _load_object_images(self, object_ids: list[int], variant: str | None = None) -> dict[int, str | None]:
+        # Only the id and link columns, never the whole row
+        with db_session_scope(commit=False) as session:
+            rows = session.query(
+                self.model.id,
+                getattr(self.model, self.config["column"]),
+                getattr(self.model, self.config["img_id"]),
+            ).filter(self.model.id.in_(object_ids)).all()
+
+        backend = get_storage_backend() if variant else None
+        return {
+            id: backend.variant_url(public_id, variant) if variant and public_id else link
+            for id, link, public_id in rows
+        }
+
+    def delete_stored_image(self, object_id: int, public_id: str):
+        # Local storage is content-addressed: another row may point at the same file
+        img_id_column = getattr(self.model, self.config["img_id"])
+        with db_session_scope(commit=False) as session:
+            shared = session.query(
+                exists().where(img_id_column == public_id, self.model.id != object_id)
+            ).scalar()
 
-        with db_session_scope(commit=True) as session:
-            obj = session.query(self.model).filter(
-                self.model.id == object_id
-            ).first()
+        if not shared:
+            get_storage_backend().delete(public_id)
 
-            if not obj:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Record not found"
-                )
+    async def delete_object_image(self, object_id: int):
+        img_id_column = getattr(self.model, self.config["img_id"])
 
-            public_id = getattr(obj, self.config["img_id"])
+        with db_session_scope(commit=False) as session:
+            row = session.query(img_id_column).filter(self.model.id == object_id).first()
 
-            if not public_id:
-                return {"message": "No image to delete"}
+        if row is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Record not found"
+            )
 
-            self.delete_from_cloudinary(public_id)
+        public_id = row[0]
+        if not public_id:
+            return {"message": "No image to delete"}
 
-            setattr(obj, self.config["column"], None)
-            setattr(obj, self.config["img_id"], None)
+        # Storage call outside any DB transaction and off the event loop
+        await run_in_threadpool(self.delete_stored_image, object_id, public_id)
 
-            return {"message": "Image deleted successfully"}
+        with db_session_scope(commit=True) as session:
+            # Only clear the columns if no newer upload replaced the image meanwhile
+            session.query(self.model).filter(
+                self.model.id == object_id,
+                img_id_column == public_id
+            ).update({
+                self.config["column"]: None,
+                self.config["img_id"]: None,
+                self.config["status"]: None,
+            })
+
+        query_cache.invalidate_rows(self.model, object_id)
+        return {"message": "Image deleted successfully"}
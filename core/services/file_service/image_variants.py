@@ -0,0 +1,156 @@
+"""Resized WebP variants of uploaded images.
+
+Variants are generated once at upload time by the upload worker and stored next
+to the original through the storage backend. Variants that are missing (images
+uploaded before a variant existed, or a failed render) are derived on request and
+kept in a bounded on-disk LRU cache (`VariantCache`).
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Literal
+
+IMAGE_VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", "80"))
+IMAGE_VARIANT_CACHE_MB = int(os.getenv("IMAGE_VARIANT_CACHE_MB", "256"))
+IMAGE_VARIANT_CACHE_DIR = os.getenv(
+    "IMAGE_VARIANT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "openspace-variants")
+)
+
+
+@dataclass(frozen=True)
+class VariantSpec:
+    width: int
+    height: int
+    # "fill": crop to exactly width x height; "limit": fit inside, keep aspect ratio
+    crop: str
+
+
+VARIANTS = {
+    "thumb": VariantSpec(96, 96, "fill"),
+    "card": VariantSpec(480, 480, "limit"),
+    "webp": VariantSpec(2048, 2048, "limit"),
+}
+
+# Accepted values of the `variant` query parameter on image routes
+ImageVariant = Literal["thumb", "card", "webp"]
+
+VARIANT_FORMAT = "webp"
+VARIANT_CONTENT_TYPE = "image/webp"
+
+
+def render_variant(source_path: str, variant: str, target) -> None:
+    """Write the `variant` of the image at `source_path` to the file object `target`."""
+    # Imported here so the app starts (and Cloudinary-only deployments work) without Pillow
+    from PIL import Image, ImageOps
+
+    spec = VARIANTS[variant]
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or "A" in image.mode else "RGB")
+
+        if spec.crop == "fill":
+            image = ImageOps.fit(image, (spec.width, spec.height), Image.Resampling.LANCZOS)
+        else:
+            image.thumbnail((spec.width, spec.height), Image.Resampling.LANCZOS)
+
+        image.save(target, format=VARIANT_FORMAT, quality=IMAGE_VARIANT_QUALITY, method=4)
+
+
+class VariantCache:
+    """On-disk LRU of derived variants, bounded by total file size."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        # Pick up files left by a previous process, oldest first
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith("." + VARIANT_FORMAT):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._size += size
+        self._loaded = True
+
+    def get(self, key: str, source_path: str, variant: str) -> bytes:
+        """Return the variant bytes for `key`, rendering from `source_path` on a miss."""
+        name = hashlib.sha256(f"{key}:{variant}".encode()).hexdigest() + "." + VARIANT_FORMAT
+        path = os.path.join(self.directory, name)
+
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            cached = name in self._entries
+            if cached:
+                self._entries.move_to_end(name)
+
+        if cached:
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                self.hits += 1
+                return data
+            except FileNotFoundError:
+                self._forget(name)
+
+        self.misses += 1
+        buffer = io.BytesIO()
+        render_variant(source_path, variant, buffer)
+        data = buffer.getvalue()
+
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+
+        self._add(name, len(data))
+        return data
+
+    def _add(self, name: str, size: int) -> None:
+        with self._lock:
+            self._size += size - self._entries.pop(name, 0)
+            self._entries[name] = size
+
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                evicted, evicted_size = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+                try:
+                    os.remove(os.path.join(self.directory, evicted))
+                except FileNotFoundError:
+                    pass
+
+    def _forget(self, name: str) -> None:
+        with self._lock:
+            self._size -= self._entries.pop(name, 0)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+variant_cache = VariantCache(IMAGE_VARIANT_CACHE_DIR, IMAGE_VARIANT_CACHE_MB * 1024 * 1024)
@@ -0,0 +1,196 @@
+"""Where uploaded images are stored.
+
+STORAGE_BACKEND selects the implementation:
+
+- "cloudinary" (default): upload to Cloudinary, the stored id is the Cloudinary public id.
+- "local": content-addressed files under MEDIA_ROOT, served by the `/media/` route
+  (or any CDN origin pointed at MEDIA_ROOT). Works offline, so image endpoints can
+  be load-tested without the network.
+
+Both backends also keep the resized variants from image_variants.py: Cloudinary
+derives them itself (eager transformations), the local backend stores rendered
+WebP files next to the original.
+
+Backends are synchronous; callers run them in worker threads.
+"""
+
+import hashlib
+import mimetypes
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import cache
+
+from core.services.file_service.file_config import cloudinary_uploader
+from core.services.file_service.image_variants import VARIANTS, VARIANT_FORMAT, render_variant
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "cloudinary").lower()
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", os.path.join(os.getcwd(), "media"))
+# Prefix of the links written to the database; set to a CDN origin in production
+MEDIA_BASE_URL = os.getenv("MEDIA_BASE_URL", "/media").rstrip("/")
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    url: str
+    object_id: str
+
+
+class StorageBackend(ABC):
+
+    name = "base"
+
+    @abstractmethod
+    def put(self, path: str, folder: str, content_type: str | None = None) -> StoredObject:
+        """Store the file at `path` under `folder`; the source file is left in place."""
+
+    @abstractmethod
+    def put_variants(self, path: str, object_id: str) -> None:
+        """Store every variant of the original at `path` already stored as `object_id`."""
+
+    @abstractmethod
+    def variant_url(self, object_id: str, variant: str) -> str:
+        """Public URL of `variant` of the stored original `object_id`."""
+
+    @abstractmethod
+    def delete(self, object_id: str) -> None:
+        """Remove the stored original and its variants."""
+
+
+class CloudinaryBackend(StorageBackend):
+
+    name = "cloudinary"
+
+    def put(self, path: str, folder: str, content_type: str | None = None) -> StoredObject:
+        with open(path, "rb") as source:
+            result = cloudinary_uploader().upload(
+                source,
+                folder=folder,
+                resource_type="image",
+                eager=[_cloudinary_transformation(variant) for variant in VARIANTS],
+                eager_async=True
+            )
+        return StoredObject(url=result["secure_url"], object_id=result["public_id"])
+
+    def put_variants(self, path: str, object_id: str) -> None:
+        # Generated by Cloudinary from the eager transformations requested in `put`
+        pass
+
+    def variant_url(self, object_id: str, variant: str) -> str:
+        cloudinary_uploader()
+        from cloudinary.utils import cloudinary_url
+
+        return cloudinary_url(object_id, secure=True, **_cloudinary_transformation(variant))[0]
+
+    def delete(self, object_id: str) -> None:
+        result = cloudinary_uploader().destroy(object_id)
+
+        if result.get("result") != "ok":
+            raise RuntimeError("Failed to delete image from Cloudinary")
+
+
+class LocalBackend(StorageBackend):
+    """Files are stored as `<folder>/<h[:2]>/<h[2:4]>/<sha256><ext>`.
+
+    Identical uploads map to the same file, and a stored file never changes, so
+    it can be served with a far-future immutable Cache-Control.
+    """
+
+    name = "local"
+
+    def __init__(self, root: str, base_url: str):
+        self.root = os.path.realpath(root)
+        self.base_url = base_url
+
+    def put(self, path: str, folder: str, content_type: str | None = None) -> StoredObject:
+        digest = _sha256(path)
+        extension = mimetypes.guess_extension(content_type or "") or ""
+        object_id = "/".join((folder, digest[:2], digest[2:4], digest + extension))
+
+        def copy(tmp):
+            with open(path, "rb") as source:
+                shutil.copyfileobj(source, tmp)
+
+        self._write(object_id, copy)
+        return StoredObject(url=f"{self.base_url}/{object_id}", object_id=object_id)
+
+    def put_variants(self, path: str, object_id: str) -> None:
+        for variant in VARIANTS:
+            self._write(
+                self.variant_object_id(object_id, variant),
+                lambda tmp, variant=variant: render_variant(path, variant, tmp),
+            )
+
+    def variant_url(self, object_id: str, variant: str) -> str:
+        return f"{self.base_url}/{self.variant_object_id(object_id, variant)}"
+
+    @staticmethod
+    def variant_object_id(object_id: str, variant: str) -> str:
+        return f"{os.path.splitext(object_id)[0]}.{variant}.{VARIANT_FORMAT}"
+
+    def original_object_id(self, variant_object_id: str) -> tuple[str, str] | None:
+        """Split `<hash>.<variant>.webp` into (original object id, variant) if the original exists."""
+        stem, variant, extension = (variant_object_id.rsplit(".", 2) + ["", ""])[:3]
+        if variant not in VARIANTS or extension != VARIANT_FORMAT:
+            return None
+
+        directory = os.path.dirname(self.resolve(variant_object_id))
+        prefix = os.path.basename(stem)
+        for name in os.listdir(directory) if os.path.isdir(directory) else ():
+            if name.split(".")[0] == prefix and name.count(".") <= 1:
+                return f"{os.path.dirname(stem)}/{name}", variant
+        return None
+
+    def _write(self, object_id: str, fill) -> None:
+        target = self.resolve(object_id)
+        if os.path.exists(target):
+            return
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Write to a temp name and rename, so readers never see a partial file
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(target), delete=False) as tmp:
+            try:
+                fill(tmp)
+            except Exception:
+                tmp.close()
+                os.remove(tmp.name)
+                raise
+        os.replace(tmp.name, target)
+
+    def delete(self, object_id: str) -> None:
+        for stored in (object_id, *(self.variant_object_id(object_id, variant) for variant in VARIANTS)):
+            try:
+                os.remove(self.resolve(stored))
+            except FileNotFoundError:
+                pass
+
+    def resolve(self, object_id: str) -> str:
+        """Absolute path of a stored object; ValueError if it points outside the root."""
+        path = os.path.realpath(os.path.join(self.root, object_id))
+        if os.path.commonpath((path, self.root)) != self.root or path == self.root:
+            raise ValueError("Invalid object id")
+        return path
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cloudinary_transformation(variant: str) -> dict:
+    spec = VARIANTS[variant]
+    return {"width": spec.width, "height": spec.height, "crop": spec.crop, "format": VARIANT_FORMAT}
+
+
+@cache
+def get_storage_backend() -> StorageBackend:
+    if STORAGE_BACKEND == "local":
+        return LocalBackend(MEDIA_ROOT, MEDIA_BASE_URL)
+    if STORAGE_BACKEND == "cloudinary":
+        return CloudinaryBackend()
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
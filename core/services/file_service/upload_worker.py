@@ -0,0 +1,165 @@
+"""Background image upload pipeline.
+
+Upload routes spool the request file to IMAGE_UPLOAD_SPOOL_DIR and return 202;
+a small thread pool stores the spooled file and its resized variants in the
+configured storage backend (see storage_backends.py) and writes the
+result (link, public id, `*_img_status`) to the row. The number of queued +
+running uploads is capped (IMAGE_UPLOAD_QUEUE_LIMIT); over the cap the route
+answers 429 before anything is spooled.
+
+Status values: "pending" -> "ready" | "failed".
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+
+from database import db_session_scope
+from core.services.cache_service.query_cache import query_cache
+from core.services.file_service.storage_backends import get_storage_backend
+from core.services.metrics_service.metrics import IMAGE_UPLOAD_SECONDS
+
+logger = logging.getLogger(__name__)
+
+IMAGE_UPLOAD_WORKERS = int(os.getenv("IMAGE_UPLOAD_WORKERS", "4"))
+IMAGE_UPLOAD_QUEUE_LIMIT = int(os.getenv("IMAGE_UPLOAD_QUEUE_LIMIT", "64"))
+IMAGE_UPLOAD_SPOOL_DIR = os.getenv(
+    "IMAGE_UPLOAD_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "openspace-uploads")
+)
+
+STATUS_PENDING = "pending"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class UploadJob:
+    model: type
+    object_id: int
+    config: dict
+    path: str
+    content_type: str | None = None
+
+
+class UploadWorker:
+
+    def __init__(self, workers: int, queue_limit: int, spool_dir: str):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.spool_dir = spool_dir
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="image-upload"
+                    )
+        return self._executor
+
+    def reserve(self) -> None:
+        """Take a queue slot or raise 429; pair with `submit` or `release`."""
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail="TOO MANY REQUESTS",
+                headers={"Retry-After": "5"},
+            )
+
+    def release(self) -> None:
+        self._slots.release()
+
+    def spool(self, source) -> str:
+        """Copy a file object to the spool directory; returns the path."""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.spool_dir, prefix="upload-", delete=False) as target:
+            shutil.copyfileobj(source, target)
+            return target.name
+
+    def submit(self, job: UploadJob) -> None:
+        """Queue a spooled upload; the slot taken by `reserve` is released when it finishes."""
+        try:
+            future = self._get_executor().submit(self._run, job)
+        except Exception:
+            self.release()
+            _remove(job.path)
+            raise
+        future.add_done_callback(lambda _: self.release())
+
+    def _run(self, job: UploadJob) -> None:
+        try:
+            started = time.perf_counter()
+            backend = get_storage_backend()
+            stored = backend.put(job.path, job.config["folder"], job.content_type)
+            try:
+                backend.put_variants(job.path, stored.object_id)
+            except Exception as e:
+                # The original is usable; missing variants are derived on request
+                logger.warning(f"Image variants for {job.model.__tablename__} {job.object_id} failed: {e}")
+            IMAGE_UPLOAD_SECONDS.observe(time.perf_counter() - started, (job.model.__name__,))
+
+            self._set_row(job, {
+                job.config["column"]: stored.url,
+                job.config["img_id"]: stored.object_id,
+                job.config["status"]: STATUS_READY,
+            })
+            self.completed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Image upload for {job.model.__tablename__} {job.object_id} failed: {e}")
+            try:
+                self._set_row(job, {job.config["status"]: STATUS_FAILED})
+            except Exception as e:
+                logger.error(f"Could not mark image upload as failed: {e}")
+        finally:
+            _remove(job.path)
+
+    @staticmethod
+    def _set_row(job: UploadJob, values: dict) -> None:
+        with db_session_scope(commit=True) as session:
+            session.query(job.model).filter(job.model.id == job.object_id).update(values)
+        query_cache.invalidate_rows(job.model, job.object_id)
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Finish queued uploads before the process exits."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+upload_worker = UploadWorker(
+    workers=IMAGE_UPLOAD_WORKERS,
+    queue_limit=IMAGE_UPLOAD_QUEUE_LIMIT,
+    spool_dir=IMAGE_UPLOAD_SPOOL_DIR,
+)
@@ -0,0 +1,91 @@
+"""Conditional GET support (ETag / If-None-Match / 304) for JSON read endpoints.
+
+The response body is rendered once, hashed into a strong ETag and kept in
+`query_cache` under the same tags as the data it was built from, so a repeat
+read costs a cache lookup and, when the client already has the current
+version, a bodyless 304 without touching the database or re-serializing.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Awaitable, Callable, Hashable, Iterable
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from core.services.cache_service.query_cache import query_cache
+from core.services.http_service.fast_json import encode_trusted
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    body: bytes
+    etag: str
+    headers: dict = field(default_factory=dict)
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def render_json(response_type, data, trusted: bool = False) -> bytes:
+    """Validate `data` against `response_type` (same rules as `response_model`) and dump it.
+
+    `trusted` data (projected rows) skips validation where fast_json supports the schema.
+    """
+    if trusted:
+        body = encode_trusted(response_type, data)
+        if body is not None:
+            return body
+
+    adapter = _adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def compute_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    candidates = (candidate.strip().removeprefix("W/") for candidate in header.split(","))
+    return etag in candidates
+
+
+def conditional_response(request: Request, rendered: RenderedResponse) -> Response:
+    headers = {"ETag": rendered.etag, "Cache-Control": "no-cache", **rendered.headers}
+    if etag_matches(request, rendered.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=rendered.body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+async def conditional_json_response(
+    request: Request,
+    cache_key: Hashable,
+    tags: Iterable[str],
+    response_type,
+    loader: Callable[[], Awaitable[tuple]],
+    trusted: bool = False,
+) -> Response:
+    """Serve `loader()` as JSON with an ETag.
+
+    `loader` returns `(data, extra_headers)`; its rendered result is cached
+    under `tags` so writes that invalidate the data also drop the body.
+    """
+
+    async def render() -> RenderedResponse:
+        data, headers = await loader()
+        body = render_json(response_type, data, trusted)
+        return RenderedResponse(body=body, etag=compute_etag(body), headers=headers)
+
+    rendered = await query_cache.cached_async(("rendered", cache_key), tags, render)
+    return conditional_response(request, rendered)
@@ -0,0 +1,109 @@
+"""Fast JSON encoding for trusted read results.
+
+Rows coming out of a projected `BaseQueries` (see projection.py) already have
+the columns and database types their response schema declares, so validating
+every field of every row through Pydantic only to dump it again is wasted
+work. `encode_trusted` reads the schema fields straight off the rows and dumps
+them with orjson; only fields that need conversion (nested models such as
+`Company.address`) go through a per-field TypeAdapter. The output is the same
+JSON the validating path produces.
+
+Opt in per endpoint with `trusted=True` on `conditional_json_response` /
+`ndjson_response`, or `response_class=FastJSONResponse` for plain dict/list
+results. Without orjson, or with FAST_JSON_ENABLED=false, everything falls back
+to the validating path.
+"""
+
+import os
+from datetime import date, datetime
+from functools import lru_cache
+from types import NoneType, UnionType
+from typing import Union, get_args, get_origin
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+FAST_JSON_ENABLED = os.getenv("FAST_JSON_ENABLED", "true").lower() == "true" and orjson is not None
+
+# Field types whose database value is already what Pydantic would emit
+_PASSTHROUGH_TYPES = {int, float, str, bool, datetime, date, NoneType}
+
+
+def _orjson_options() -> int:
+    # Pydantic writes UTC datetimes with a "Z" suffix and accepts int dict keys
+    return orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _is_passthrough(annotation) -> bool:
+    if get_origin(annotation) in (Union, UnionType):
+        return all(arg in _PASSTHROUGH_TYPES for arg in get_args(annotation))
+    return annotation in _PASSTHROUGH_TYPES
+
+
+class _RowEncoder:
+
+    def __init__(self, schema: type[BaseModel]):
+        self.fields = [
+            (name, None if _is_passthrough(field.annotation) else TypeAdapter(field.annotation))
+            for name, field in schema.model_fields.items()
+        ]
+
+    def to_dict(self, row) -> dict:
+        data = {}
+        for name, adapter in self.fields:
+            value = getattr(row, name)
+            if adapter is not None:
+                value = adapter.dump_python(adapter.validate_python(value, from_attributes=True), mode="json")
+            data[name] = value
+        return data
+
+
+@lru_cache(maxsize=None)
+def _encoder(schema: type[BaseModel]) -> _RowEncoder | None:
+    """Encoder for `schema`, or None if it customizes (de)serialization and must be validated."""
+    decorators = schema.__pydantic_decorators__
+    if (
+        decorators.validators or decorators.field_validators or decorators.model_validators
+        or decorators.field_serializers or decorators.model_serializers or decorators.computed_fields
+    ):
+        return None
+    if any(field.alias or field.serialization_alias for field in schema.model_fields.values()):
+        return None
+    return _RowEncoder(schema)
+
+
+def _schema_of(response_type) -> tuple[type[BaseModel] | None, bool]:
+    """(schema, many) for `Schema` / `list[Schema]` response types."""
+    many = get_origin(response_type) is list
+    schema = get_args(response_type)[0] if many else response_type
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        return schema, many
+    return None, many
+
+
+def encode_trusted(response_type, data) -> bytes | None:
+    """JSON for trusted `data` of `response_type`, or None when the fast path does not apply."""
+    if not FAST_JSON_ENABLED:
+        return None
+
+    schema, many = _schema_of(response_type)
+    encoder = _encoder(schema) if schema else None
+    if encoder is None:
+        return None
+
+    content = [encoder.to_dict(row) for row in data] if many else encoder.to_dict(data)
+    return orjson.dumps(content, option=_orjson_options())
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available."""
+
+    def render(self, content) -> bytes:
+        if not FAST_JSON_ENABLED:
+            return super().render(content)
+        return orjson.dumps(content, option=_orjson_options())
@@ -0,0 +1,67 @@
+"""Application metrics, exposed on `/metrics`."""
+
+from core.services.metrics_service.registry import MetricsRegistry
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP responses by method, route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.",
+    ("method", "route"),
+)
+HTTP_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.",
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "db_query_duration_seconds", "SQL statement execution time (requires SQL profiling).",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+PASSWORD_HASHING_SECONDS = registry.histogram(
+    "password_hashing_duration_seconds", "Argon2 hash/verify time on the hashing pool.",
+    ("operation",),
+    buckets=(0.025, 0.05, 0.1, 0.15, 0.25, 0.5, 1.0, 2.5),
+)
+IMAGE_UPLOAD_SECONDS = registry.histogram(
+    "image_upload_duration_seconds", "Image upload time to the storage provider.",
+    ("model",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+def _pool_connections() -> dict:
+    import database.database as database
+
+    values = {}
+    for engine_name, metrics in database.get_pool_metrics().items():
+        for state in ("size", "checked_in", "checked_out", "overflow"):
+            values[(engine_name, state)] = metrics[state]
+    return values
+
+
+def _pool_checkout_timeouts() -> dict:
+    import database.database as database
+
+    return {(engine_name,): metrics.get("timeouts", 0) for engine_name, metrics in database.get_pool_metrics().items()}
+
+
+def _hashing_rejected() -> dict:
+    from core.security.hashing_executor import hashing_executor
+
+    return {(): hashing_executor.rejected}
+
+
+registry.gauge_function(
+    "db_pool_connections", "Connection pool usage by engine and state.",
+    _pool_connections, ("engine", "state"),
+)
+registry.gauge_function(
+    "db_pool_checkout_timeouts", "Pool checkouts that timed out, by engine.",
+    _pool_checkout_timeouts, ("engine",),
+)
+registry.gauge_function(
+    "password_hashing_rejected", "Hashing calls rejected with 429 because the queue was full.",
+    _hashing_rejected,
+)
@@ -1,13 +1,26 @@
 import logging
+from contextlib import contextmanager
 
 from fastapi import Query
 from fastapi import HTTPException
 
 from pydantic import BaseModel
+from sqlalchemy import delete, insert, select, tuple_, update
 from sqlalchemy.exc import IntegrityError
 
 from database import db_session_scope
+from database import async_db_session_scope
 from database import MissingDatabaseError
+from core.services.cache_service.query_cache import query_cache, model_tag, row_tags
+from core.services.queries_service.bulk import BULK_BATCH_SIZE, BulkResult, batched
+from core.services.queries_service.load_profiles import load_options
+from core.services.queries_service.projection import projected_columns
+from core.services.queries_service.pagination import (
+    STREAM_CHUNK_SIZE,
+    decode_cursor,
+    encode_cursor,
+    parse_sort,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -15,34 +28,126 @@ logger = logging.getLogger(__name__)
 
 class BaseQueries:
 
-    def __init__(self, model):
+    def __init__(
+        self,
+        model,
+        sortable: tuple[str, ...] = ("id",),
+        cached: bool = False,
+        profile: str | None = None,
+        version_column: str | None = None,
+        schema: type[BaseModel] | None = None,
+    ):
         self.model = model
+        self.sortable = sortable
+        # Default load profile (see load_profiles.py) for reads of this service
+        self.profile = profile
+        load_options(model, profile)
+        # Projection mode (see projection.py): reads other than *_with_relations select only
+        # the columns of `schema` and return Row objects instead of ORM instances
+        if schema is not None and profile is not None:
+            raise ValueError("A projected service cannot use a load profile")
+        self.schema = schema
+        self.columns = projected_columns(model, schema, ("id", *sortable)) if schema else None
+        # Integer column used for optimistic concurrency in update_record
+        self.version_column = version_column
+        # Serve get_by_id / get_page (and async variants) from `query_cache`.
+        # Writes through BaseQueries invalidate the cache whether or not reads are cached.
+        self.cached = cached
+
+    def _cached(self, key: tuple, tags: list, loader):
+        if not self.cached:
+            return loader()
+        return query_cache.cached((self.model.__tablename__, self.profile, self.schema, *key), tags, loader)
+
+    async def _cached_async(self, key: tuple, tags: list, loader):
+        if not self.cached:
+            return await loader()
+        return await query_cache.cached_async((self.model.__tablename__, self.profile, self.schema, *key), tags, loader)
 
     def get_all(self):
         try:
             with db_session_scope(commit=False) as session:
-                return session.query(self.model).all()
+                if self.columns:
+                    return session.execute(self._select()).all()
+                return self.add_relation_args(self._relations(), session.query(self.model)).all()
         except MissingDatabaseError:
             logger.error("Database for provided object does not exist")
             raise HTTPException(404)
 
-    def get_all_with_relations(self, relations: list = []):
+    def get_all_with_relations(self, relations: list = [], profile: str | None = None):
         try:
             with db_session_scope(commit=False) as session:
                 query = session.query(self.model)
-                if relations:
-                    query = self.add_relation_args(relations, query)
+                query = self.add_relation_args(self._relations(relations, profile), query)
                 return query.all()
         except MissingDatabaseError:
             logger.error("Database for provided object does not exist")
             raise HTTPException(404)
 
-    def get_by_id_with_relations(self, id: int, relations: list = []):
+    def get_page(self, limit: int, cursor: str | None = None, sort: str = "id", filters=None):
+        """Return one keyset page and the cursor of the next one (None on the last page).
+
+        `filters` is a hashable object whose `clauses()` returns WHERE clauses (e.g. JobFilters).
+        """
+        return self._cached(
+            ("page", limit, cursor, sort, filters),
+            [model_tag(self.model)],
+            lambda: self._load_page(limit, cursor, sort, filters),
+        )
+
+    def _load_page(self, limit: int, cursor: str | None, sort: str, filters=None):
+        try:
+            with db_session_scope(commit=False) as session:
+                query, keyset = self._keyset_query(sort, cursor, filters)
+                rows = self._rows(session.execute(query.limit(limit + 1)))
+        except MissingDatabaseError:
+            logger.error("Database for provided object does not exist")
+            raise HTTPException(404)
+
+        return self._page_result(rows, limit, sort, keyset)
+
+    def stream_all(self, sort: str = "id", chunk_size: int = STREAM_CHUNK_SIZE, filters=None):
+        """Yield every row through a server-side cursor, `chunk_size` rows in memory at a time."""
+        query, _ = self._keyset_query(sort, None, filters)
+        try:
+            with db_session_scope(commit=False) as session:
+                result = session.execute(query.execution_options(yield_per=chunk_size))
+                for row in (result if self.columns else result.scalars()):
+                    yield row
+        except MissingDatabaseError:
+            logger.error("Database for provided object does not exist")
+            raise HTTPException(404)
+
+    def _page_result(self, rows: list, limit: int, sort: str, keyset: list):
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(sort, [getattr(last, column.key) for column in keyset])
+
+    def _keyset_query(self, sort: str, cursor: str | None, filters=None):
+        column_name, descending = parse_sort(sort, self.sortable)
+        keyset = [getattr(self.model, column_name)]
+        if column_name != "id":
+            keyset.append(self.model.id)
+
+        query = self._select()
+        if filters is not None:
+            query = query.where(*filters.clauses())
+        if cursor:
+            values = decode_cursor(cursor, sort, keyset)
+            key = tuple_(*keyset)
+            query = query.where(key < tuple_(*values) if descending else key > tuple_(*values))
+
+        order = [column.desc() if descending else column.asc() for column in keyset]
+        return query.order_by(*order), keyset
+
+    def get_by_id_with_relations(self, id: int, relations: list = [], profile: str | None = None):
         try:
             with db_session_scope(commit=False) as session:
                 query = session.query(self.model).filter(self.model.id == id)
-                if relations:
-                    query = self.add_relation_args(relations, query)
+                query = self.add_relation_args(self._relations(relations, profile), query)
                 response = query.first()
                 if response is None:
                     raise HTTPException(404)
@@ -52,13 +157,16 @@ class BaseQueries:
             raise HTTPException(404)
 
     def get_by_id(self, id: int):
+        return self._cached(("by_id", id), row_tags(self.model, id), lambda: self._load_by_id(id))
+
+    def _load_by_id(self, id: int):
         try:
             with db_session_scope(commit=False) as session:
-                result = (
-                    session.query(self.model)
-                    .filter(self.model.id == id)
-                    .first()
-                )
+                if self.columns:
+                    result = session.execute(self._select().where(self.model.id == id)).first()
+                else:
+                    query = session.query(self.model).filter(self.model.id == id)
+                    result = self.add_relation_args(self._relations(), query).first()
                 if result is None:
                    raise HTTPException(status_code=404, detail="Object not found")
                 return result
@@ -70,7 +178,8 @@ class BaseQueries:
         try:
             with db_session_scope(commit=True) as session:
                 session.add(self.model(**dataResponse.__dict__))
-                return dataResponse
+            query_cache.invalidate_model(self.model)
+            return dataResponse
         except IntegrityError as e:
             logger.warning(
                 f"{self.model.__tablename__} - One of the foreign keys might cause an error."
@@ -82,18 +191,35 @@ class BaseQueries:
             raise HTTPException(404)
 
     def update_record(self, model_obj: BaseModel):
+        """Partial in-place UPDATE ... RETURNING of the fields set on `model_obj` (which must carry `id`).
+
+        With `version_column`, `model_obj` must also carry the version it was read at;
+        the row is only updated if it still has that version (else 409), and the
+        version is bumped in the same statement.
+        """
+        data = model_obj.model_dump(exclude_unset=True)
+        id = data.pop("id")
+        if not data or set(data) == {self.version_column}:
+            return self._load_by_id(id)
         try:
             with db_session_scope(commit=True) as session:
-                data = (
-                    session.query(self.model)
-                    .filter(self.model.id == model_obj.id)
-                    .first()
-                )
-                if data is None:
-                    raise HTTPException(404)
-                session.delete(data)
-                session.add(self.model(**model_obj.__dict__))
-                return model_obj
+                statement = update(self.model).where(self.model.id == id)
+                if self.version_column:
+                    version = getattr(self.model, self.version_column)
+                    statement = statement.where(version == data.pop(self.version_column, None))
+                    data[self.version_column] = version + 1
+
+                statement = statement.values(**data).returning(self.model)
+                updated = session.execute(
+                    statement, execution_options={"synchronize_session": False}
+                ).scalars().first()
+                if updated is None:
+                    exists = session.query(self.model.id).filter(self.model.id == id).first()
+                    raise HTTPException(409 if exists else 404)
+                # Detach before commit so the RETURNING values are not expired
+                session.expunge(updated)
+            query_cache.invalidate_rows(self.model, id)
+            return updated
         except IntegrityError:
             logger.warning(
                 f"{self.model.__tablename__} - One of the foreign keys might cause an error."
@@ -114,11 +240,249 @@ class BaseQueries:
                 if data is None:
                     raise HTTPException(404)
                 session.delete(data)
-                return (data)
+            query_cache.invalidate_rows(self.model, id)
+            return (data)
+        except MissingDatabaseError:
+            logger.error("Database for provided object does not exist")
+            raise HTTPException(404)
+
+    # =====================
+    # Bulk writes: each batch is one statement in its own transaction; when a batch
+    # fails, its items are retried one by one (each in a SAVEPOINT) to report
+    # per-item errors without losing the valid ones.
+    # =====================
+
+    def bulk_insert(self, items: list[tuple[int, dict]], result: BulkResult, batch_size: int = BULK_BATCH_SIZE):
+        """Insert `(index, values)` items with INSERT ... RETURNING id; outcomes go to `result`."""
+        statement = insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+        for batch in batched(items, batch_size):
+            with self._bulk_session() as session:
+                try:
+                    with session.begin_nested():
+                        ids = session.execute(statement, [values for _, values in batch]).scalars().all()
+                except IntegrityError:
+                    self._bulk_insert_one_by_one(session, batch, result)
+                    continue
+                for (index, _), id in zip(batch, ids):
+                    result.ok(index, id, status=201)
+
+        query_cache.invalidate_model(self.model)
+
+    def _bulk_insert_one_by_one(self, session, batch: list, result: BulkResult):
+        for index, values in batch:
+            try:
+                with session.begin_nested():
+                    id = session.execute(insert(self.model).values(**values).returning(self.model.id)).scalar_one()
+                result.ok(index, id, status=201)
+            except IntegrityError:
+                result.error(index, 409, "INTEGRITY_ERROR")
+
+    def bulk_update(self, items: list[tuple[int, dict]], result: BulkResult, batch_size: int = BULK_BATCH_SIZE):
+        """Partial update of `(index, values)` items by primary key (`values` carry `id`).
+
+        Unknown ids are found with one locking IN query per batch rather than from
+        the executemany rowcount, which psycopg2 does not report for multi-row batches.
+        """
+        for batch in batched(items, batch_size):
+            with self._bulk_session() as session:
+                ids = {values["id"] for _, values in batch}
+                existing = set(session.execute(
+                    select(self.model.id).where(self.model.id.in_(ids)).with_for_update()
+                ).scalars())
+
+                found = []
+                for index, values in batch:
+                    if values["id"] in existing:
+                        found.append((index, values))
+                    else:
+                        result.error(index, 404, "NOT_FOUND", id=values["id"])
+
+                rows = [values for _, values in found if len(values) > 1]
+                try:
+                    if rows:
+                        with session.begin_nested():
+                            session.execute(update(self.model), rows)
+                except IntegrityError:
+                    self._bulk_update_one_by_one(session, found, result)
+                    continue
+                for index, values in found:
+                    result.ok(index, values["id"])
+
+        query_cache.invalidate_rows(self.model, *result.succeeded_ids())
+
+    def _bulk_update_one_by_one(self, session, batch: list, result: BulkResult):
+        for index, values in batch:
+            values = dict(values)
+            id = values.pop("id")
+            try:
+                with session.begin_nested():
+                    statement = update(self.model).where(self.model.id == id)
+                    if values:
+                        updated = session.execute(
+                            statement.values(**values).returning(self.model.id),
+                            execution_options={"synchronize_session": False},
+                        ).scalar()
+                    else:
+                        updated = session.query(self.model.id).filter(self.model.id == id).scalar()
+                if updated is None:
+                    result.error(index, 404, "NOT_FOUND", id=id)
+                else:
+                    result.ok(index, id)
+            except IntegrityError:
+                result.error(index, 409, "INTEGRITY_ERROR", id=id)
+
+    def bulk_delete(self, items: list[tuple[int, int]], result: BulkResult, batch_size: int = BULK_BATCH_SIZE):
+        """Delete `(index, id)` items with DELETE ... WHERE id IN (...) RETURNING id."""
+        for batch in batched(items, batch_size):
+            ids = [id for _, id in batch]
+            with self._bulk_session() as session:
+                try:
+                    with session.begin_nested():
+                        self._before_bulk_delete(session, ids)
+                        deleted = set(session.execute(
+                            delete(self.model).where(self.model.id.in_(ids)).returning(self.model.id),
+                            execution_options={"synchronize_session": False},
+                        ).scalars())
+                except IntegrityError:
+                    deleted = self._bulk_delete_one_by_one(session, batch, result)
+
+            failed = result.failed_indexes()
+            for index, id in batch:
+                if id in deleted:
+                    result.ok(index, id)
+                elif index not in failed:
+                    result.error(index, 404, "NOT_FOUND", id=id)
+
+        query_cache.invalidate_rows(self.model, *result.succeeded_ids())
+
+    def _bulk_delete_one_by_one(self, session, batch: list, result: BulkResult) -> set:
+        deleted = set()
+        for index, id in batch:
+            try:
+                with session.begin_nested():
+                    self._before_bulk_delete(session, [id])
+                    if session.execute(
+                        delete(self.model).where(self.model.id == id).returning(self.model.id),
+                        execution_options={"synchronize_session": False},
+                    ).scalar() is not None:
+                        deleted.add(id)
+            except IntegrityError:
+                result.error(index, 409, "INTEGRITY_ERROR", id=id)
+        return deleted
+
+    def _before_bulk_delete(self, session, ids: list[int]) -> None:
+        """Core DELETE skips ORM cascades; subclasses remove dependent rows here."""
+
+    @contextmanager
+    def _bulk_session(self):
+        try:
+            with db_session_scope(commit=True) as session:
+                yield session
+        except MissingDatabaseError:
+            logger.error("Database for provided object does not exist")
+            raise HTTPException(404)
+
+    # =====================
+    # Async read variants (AsyncSession, do not block the event loop)
+    # =====================
+
+    async def async_get_all(self):
+        if not self.columns:
+            return await self.async_get_all_with_relations()
+
+        try:
+            async with async_db_session_scope(commit=False) as session:
+                return (await session.execute(self._select())).all()
+        except MissingDatabaseError:
+            logger.error("Database for provided object does not exist")
+            raise HTTPException(404)
+
+    async def async_get_all_with_relations(self, relations: list = [], profile: str | None = None):
+        try:
+            async with async_db_session_scope(commit=False) as session:
+                query = self.add_relation_args(self._relations(relations, profile), select(self.model))
+                result = await session.execute(query)
+                return result.scalars().all()
+        except MissingDatabaseError:
+            logger.error("Database for provided object does not exist")
+            raise HTTPException(404)
+
+    async def async_get_by_id(self, id: int):
+        return await self._cached_async(
+            ("by_id", id),
+            row_tags(self.model, id),
+            lambda: self._async_load_by_id(id),
+        )
+
+    async def _async_load_by_id(self, id: int):
+        if not self.columns:
+            return await self.async_get_by_id_with_relations(id)
+
+        try:
+            async with async_db_session_scope(commit=False) as session:
+                result = (await session.execute(self._select().where(self.model.id == id))).first()
+                if result is None:
+                    raise HTTPException(status_code=404, detail="Object not found")
+                return result
         except MissingDatabaseError:
             logger.error("Database for provided object does not exist")
             raise HTTPException(404)
 
+    async def async_get_by_id_with_relations(self, id: int, relations: list = [], profile: str | None = None):
+        try:
+            async with async_db_session_scope(commit=False) as session:
+                query = select(self.model).where(self.model.id == id)
+                query = self.add_relation_args(self._relations(relations, profile), query)
+                result = (await session.execute(query)).scalars().first()
+                if result is None:
+                    raise HTTPException(status_code=404, detail="Object not found")
+                return result
+        except MissingDatabaseError:
+            logger.error("Database for provided object does not exist")
+            raise HTTPException(404)
+
+    async def async_get_page(self, limit: int, cursor: str | None = None, sort: str = "id", filters=None):
+        return await self._cached_async(
+            ("page", limit, cursor, sort, filters),
+            [model_tag(self.model)],
+            lambda: self._async_load_page(limit, cursor, sort, filters),
+        )
+
+    async def _async_load_page(self, limit: int, cursor: str | None, sort: str, filters=None):
+        try:
+            async with async_db_session_scope(commit=False) as session:
+                query, keyset = self._keyset_query(sort, cursor, filters)
+                rows = self._rows(await session.execute(query.limit(limit + 1)))
+        except MissingDatabaseError:
+            logger.error("Database for provided object does not exist")
+            raise HTTPException(404)
+
+        return self._page_result(rows, limit, sort, keyset)
+
+    async def async_stream_all(self, sort: str = "id", chunk_size: int = STREAM_CHUNK_SIZE, filters=None):
+        query, _ = self._keyset_query(sort, None, filters)
+        try:
+            async with async_db_session_scope(commit=False) as session:
+                query = query.execution_options(yield_per=chunk_size)
+                result = await (session.stream(query) if self.columns else session.stream_scalars(query))
+                async for row in result:
+                    yield row
+        except MissingDatabaseError:
+            logger.error("Database for provided object does not exist")
+            raise HTTPException(404)
+
+    def _select(self):
+        if self.columns:
+            return select(*self.columns)
+        return self.add_relation_args(self._relations(), select(self.model))
+
+    def _rows(self, result) -> list:
+        return result.all() if self.columns else result.scalars().all()
+
+    def _relations(self, relations: list = [], profile: str | None = None) -> list:
+        # Explicit loader options are applied after (and so override) the profile's
+        return [*load_options(self.model, profile or self.profile), *relations]
+
     def add_relation_args(self, relations: list, query: Query):
         for relation in relations:
             query = query.options(relation)
@@ -0,0 +1,37 @@
+"""Helpers for bulk create/update/delete endpoints (per-item results, batching)."""
+
+import os
+from itertools import islice
+
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "500"))
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
+
+def batched(items: list, size: int):
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class BulkResult:
+    """Outcome of every item of a bulk request, keyed by its position in the request."""
+
+    def __init__(self):
+        self._items: dict[int, dict] = {}
+
+    def ok(self, index: int, id: int, status: int = 200) -> None:
+        self._items[index] = {"index": index, "id": id, "status": status, "detail": None}
+
+    def error(self, index: int, status: int, detail: str, id: int | None = None) -> None:
+        self._items[index] = {"index": index, "id": id, "status": status, "detail": detail}
+
+    def failed_indexes(self) -> set[int]:
+        return {index for index, item in self._items.items() if item["detail"] is not None}
+
+    def succeeded_ids(self) -> list[int]:
+        return [item["id"] for item in self._items.values() if item["detail"] is None]
+
+    def to_dict(self) -> dict:
+        results = [self._items[index] for index in sorted(self._items)]
+        failed = sum(1 for item in results if item["detail"] is not None)
+        return {"succeeded": len(results) - failed, "failed": failed, "results": results}
@@ -1,6 +1,10 @@
 import logging
 
 from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from core.services.cache_service.query_cache import query_cache
 
 from database import db_session_scope
 from database import MissingDatabaseError
@@ -10,6 +14,121 @@ from .base_queries import BaseQueries
 
 logger = logging.getLogger(__name__)
 
+# Postgres SQLSTATE for a foreign key violation (unknown company)
+FOREIGN_KEY_VIOLATION = "23503"
+
+# rating is always re-derived from the exact integer sum, so no float drift accumulates
+_DERIVED_RATING = "COALESCE(ROUND(({sum})::numeric / NULLIF({count}, 0), 2), 0)"
+
+# Upserts the user's rating and yields how the company aggregates must shift.
+# `previous` reads the pre-statement snapshot; xmax = 0 tells a fresh insert from
+# a conflict update. If two requests of the same user race on a first rating, the
+# loser counts as an update with delta 0 and the reconciliation job restores the
+# exact sum.
+_RATING_DELTA_CTE = """
+WITH previous AS (
+    SELECT score FROM company_rating
+    WHERE company_id = :company_id AND user_id = :user_id
+),
+upserted AS (
+    INSERT INTO company_rating (company_id, user_id, score)
+    VALUES (:company_id, :user_id, :score)
+    ON CONFLICT ON CONSTRAINT unique_user_company_rating
+    DO UPDATE SET score = EXCLUDED.score
+    RETURNING score, (xmax = 0) AS inserted
+),
+delta AS (
+    SELECT
+        CASE WHEN upserted.inserted THEN upserted.score
+             ELSE upserted.score - COALESCE(previous.score, upserted.score) END AS sum_delta,
+        CASE WHEN upserted.inserted THEN 1 ELSE 0 END AS count_delta
+    FROM upserted LEFT JOIN previous ON true
+)
+"""
+
+# One round-trip: the upsert and the aggregate shift run in the same statement
+UPSERT_RATING_SQL = text(_RATING_DELTA_CTE + f"""
+UPDATE company SET
+    ratings_sum = company.ratings_sum + delta.sum_delta,
+    ratings_count = COALESCE(company.ratings_count, 0) + delta.count_delta,
+    rating = {_DERIVED_RATING.format(
+        sum="company.ratings_sum + delta.sum_delta",
+        count="COALESCE(company.ratings_count, 0) + delta.count_delta",
+    )}
+FROM delta
+WHERE company.id = :company_id
+RETURNING company.id AS company_id, company.rating, company.ratings_count
+""")
+
+# Buffered mode: only the rating row is written, the delta goes to the rating buffer.
+# The stored aggregates come back too, so the caller can answer with an estimate.
+UPSERT_RATING_ROW_SQL = text(_RATING_DELTA_CTE + """
+SELECT delta.sum_delta, delta.count_delta,
+       company.ratings_sum, COALESCE(company.ratings_count, 0) AS ratings_count
+FROM delta JOIN company ON company.id = :company_id
+""")
+
+APPLY_RATING_DELTA_SQL = text(f"""
+UPDATE company SET
+    ratings_sum = company.ratings_sum + :sum_delta,
+    ratings_count = COALESCE(company.ratings_count, 0) + :count_delta,
+    rating = {_DERIVED_RATING.format(
+        sum="company.ratings_sum + :sum_delta",
+        count="COALESCE(company.ratings_count, 0) + :count_delta",
+    )}
+WHERE company.id = :company_id
+""")
+
+DELETE_RATING_SQL = text(f"""
+WITH removed AS (
+    DELETE FROM company_rating
+    WHERE company_id = :company_id AND user_id = :user_id
+    RETURNING company_id, score
+)
+UPDATE company SET
+    ratings_sum = company.ratings_sum - removed.score,
+    ratings_count = COALESCE(company.ratings_count, 0) - 1,
+    rating = {_DERIVED_RATING.format(
+        sum="company.ratings_sum - removed.score",
+        count="COALESCE(company.ratings_count, 0) - 1",
+    )}
+FROM removed
+WHERE company.id = removed.company_id
+RETURNING company.id
+""")
+
+# Buffered mode: only the rating row is deleted, its removal goes to the rating buffer
+# as a (-score, -1) delta so it nets out a vote that has not been flushed yet
+DELETE_RATING_ROW_SQL = text("""
+DELETE FROM company_rating
+WHERE company_id = :company_id AND user_id = :user_id
+RETURNING score
+""")
+
+# Recompute aggregates from company_rating; only rows that drifted are written
+RECONCILE_RATINGS_SQL = text(f"""
+WITH actual AS (
+    SELECT company.id,
+           COALESCE(SUM(company_rating.score), 0)::integer AS ratings_sum,
+           COUNT(company_rating.id)::integer AS ratings_count
+    FROM company
+    LEFT JOIN company_rating ON company_rating.company_id = company.id
+    WHERE CAST(:company_id AS integer) IS NULL OR company.id = :company_id
+    GROUP BY company.id
+)
+UPDATE company SET
+    ratings_sum = actual.ratings_sum,
+    ratings_count = actual.ratings_count,
+    rating = {_DERIVED_RATING.format(sum="actual.ratings_sum", count="actual.ratings_count")}
+FROM actual
+WHERE company.id = actual.id
+  AND (company.ratings_sum IS DISTINCT FROM actual.ratings_sum
+       OR company.ratings_count IS DISTINCT FROM actual.ratings_count
+       OR company.rating IS DISTINCT FROM {_DERIVED_RATING.format(
+           sum="actual.ratings_sum", count="actual.ratings_count")})
+RETURNING company.id
+""")
+
 
 class CompanyRatingQueriesService(BaseQueries):
     def __init__(self):
@@ -39,79 +158,100 @@ class CompanyRatingQueriesService(BaseQueries):
             raise HTTPException(500)
 
     def upsert_rating_entry(self, company_id: int, user_id: int, score: int):
+        params = {"company_id": company_id, "user_id": user_id, "score": score}
         try:
             with db_session_scope(commit=True) as session:
-                existing_rating = session.query(CompanyRating).filter(
-                    CompanyRating.company_id == company_id,
-                    CompanyRating.user_id == user_id
-                ).first()
+                row = session.execute(UPSERT_RATING_SQL, params).one()
 
-                company = session.query(Company).filter(Company.id == company_id).first()
-                if not company:
-                    raise HTTPException(status_code=404, detail="Company not found")
-
-                old_count = company.ratings_count or 0
-                old_avg = float(company.rating) if company.rating else 0.0
-
-                if existing_rating:
-                    old_score = existing_rating.score
-                    existing_rating.score = score
-
-                    new_count = old_count
-                    new_avg = ((old_avg * old_count) - old_score + score) / new_count
-                else:
-                    new_rating = CompanyRating(
-                        company_id=company_id,
-                        user_id=user_id,
-                        score=score
-                    )
-                    session.add(new_rating)
-
-                    new_count = old_count + 1
-                    new_avg = ((old_avg * old_count) + score) / new_count
-
-                company.ratings_count = new_count
-                company.rating = new_avg
-
-                return {
-                    "company_id": company_id,
-                    "rating": round(new_avg, 2),
-                    "ratings_count": new_count
-                }
+            query_cache.invalidate_rows(Company, company_id)
+            return {
+                "company_id": row.company_id,
+                "rating": float(row.rating),
+                "ratings_count": row.ratings_count
+            }
+        except IntegrityError as e:
+            if getattr(e.orig, "pgcode", None) == FOREIGN_KEY_VIOLATION:
+                raise HTTPException(status_code=404, detail="Company not found")
+            logger.error(f"Error during rating upsert: {e}")
+            raise HTTPException(status_code=500, detail="Could not process rating")
         except Exception as e:
             logger.error(f"Error during rating upsert: {e}")
             raise HTTPException(status_code=500, detail="Could not process rating")
 
-    def delete_raing_entry(self, company_id: int, user_id: int):
+    def upsert_rating_row(self, company_id: int, user_id: int, score: int):
+        """Write the rating row only; returns the aggregate delta and the stored aggregates."""
+        params = {"company_id": company_id, "user_id": user_id, "score": score}
         try:
             with db_session_scope(commit=True) as session:
-                rating_entry = session.query(CompanyRating).filter(
-                    CompanyRating.company_id == company_id,
-                    CompanyRating.user_id == user_id
-                ).first()
-
-                if not rating_entry:
-                    raise HTTPException(status_code=404, detail="Rating not found")
-                score_to_remove = rating_entry.score
-                session.delete(rating_entry)
+                return session.execute(UPSERT_RATING_ROW_SQL, params).one()
+        except IntegrityError as e:
+            if getattr(e.orig, "pgcode", None) == FOREIGN_KEY_VIOLATION:
+                raise HTTPException(status_code=404, detail="Company not found")
+            logger.error(f"Error during rating upsert: {e}")
+            raise HTTPException(status_code=500, detail="Could not process rating")
+        except Exception as e:
+            logger.error(f"Error during rating upsert: {e}")
+            raise HTTPException(status_code=500, detail="Could not process rating")
 
-                company = session.query(Company).filter(Company.id == company_id).first()
-                if company and company.ratings_count > 0:
-                    old_count = company.ratings_count
-                    old_avg = float(company.rating)
+    def apply_rating_deltas(self, deltas: dict[int, tuple[int, int]]) -> None:
+        """Shift aggregates of many companies in one batched UPDATE; `deltas` maps id -> (sum, count)."""
+        params = [
+            {"company_id": company_id, "sum_delta": sum_delta, "count_delta": count_delta}
+            for company_id, (sum_delta, count_delta) in sorted(deltas.items())
+        ]
+        with db_session_scope(commit=True) as session:
+            session.execute(APPLY_RATING_DELTA_SQL, params)
 
-                    new_count = old_count - 1
+        query_cache.invalidate_rows(Company, *deltas)
 
-                    if new_count > 0:
-                        new_avg = ((old_avg * old_count) - score_to_remove) / new_count
-                    else:
-                        new_avg = 0.0
+    def delete_raing_entry(self, company_id: int, user_id: int):
+        try:
+            with db_session_scope(commit=True) as session:
+                deleted = session.execute(
+                    DELETE_RATING_SQL, {"company_id": company_id, "user_id": user_id}
+                ).first()
 
-                    company.ratings_count = new_count
-                    company.rating = new_avg
+            if deleted is None:
+                raise HTTPException(status_code=404, detail="Rating not found")
+            query_cache.invalidate_rows(Company, company_id)
+            return {"message": "Rating deleted successfully"}
 
-                return {"message": "Rating deleted successfully"}
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error during rating deletion: {e}")
+            raise HTTPException(status_code=500, detail="Could not delete rating")
 
+    def delete_rating_row(self, company_id: int, user_id: int) -> int:
+        """Delete the rating row only; returns its score for the aggregate delta."""
+        try:
+            with db_session_scope(commit=True) as session:
+                score = session.execute(
+                    DELETE_RATING_ROW_SQL, {"company_id": company_id, "user_id": user_id}
+                ).scalar()
         except Exception as e:
             logger.error(f"Error during rating deletion: {e}")
             raise HTTPException(status_code=500, detail="Could not delete rating")
+
+        if score is None:
+            raise HTTPException(status_code=404, detail="Rating not found")
+        return score
+
+    def reconcile_rating_aggregates(self, company_id: int | None = None) -> list[int]:
+        """Recompute ratings_sum/ratings_count/rating from company_rating.
+
+        Returns ids of companies whose stored aggregates had drifted.
+        """
+        try:
+            with db_session_scope(commit=True) as session:
+                fixed = list(session.execute(
+                    RECONCILE_RATINGS_SQL, {"company_id": company_id}
+                ).scalars())
+        except MissingDatabaseError:
+            logger.error("Database for provided object does not exist")
+            raise HTTPException(500)
+
+        if fixed:
+            logger.warning(f"Reconciled rating aggregates of {len(fixed)} companies")
+            query_cache.invalidate_rows(Company, *fixed)
+        return fixed
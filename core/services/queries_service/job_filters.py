@@ -0,0 +1,66 @@
+"""Server-side filters for the job feed (`GET /job/`, `GET /job/facets/`).
+
+`JobFilters` is frozen and hashable, so it is part of the query-cache and
+rendered-response keys, and `BaseQueries` applies it through `clauses()`.
+Supporting indexes are declared on `Job` and `EntityTag` in database/models.py.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from fastapi import HTTPException, Query
+from sqlalchemy import exists, func, or_
+
+from database.models import EntityTag, Job
+
+
+@dataclass(frozen=True)
+class JobFilters:
+    min_payoff: float | None = None
+    max_payoff: float | None = None
+    company_ids: tuple[int, ...] = ()
+    # Jobs tagged with any of these tags
+    tag_ids: tuple[int, ...] = ()
+    posted_since: datetime | None = None
+    exclude_expired: bool = False
+
+    def clauses(self) -> list:
+        clauses = []
+        if self.min_payoff is not None:
+            clauses.append(Job.payoff >= self.min_payoff)
+        if self.max_payoff is not None:
+            clauses.append(Job.payoff <= self.max_payoff)
+        if self.company_ids:
+            clauses.append(Job.company_id.in_(self.company_ids))
+        if self.tag_ids:
+            clauses.append(exists().where(
+                EntityTag.entity_type == "job",
+                EntityTag.entity_id == Job.id,
+                EntityTag.tag_id.in_(self.tag_ids),
+            ))
+        if self.posted_since is not None:
+            clauses.append(Job.posting_date >= self.posted_since)
+        if self.exclude_expired:
+            clauses.append(or_(Job.expiry_date.is_(None), Job.expiry_date > func.now()))
+        return clauses
+
+
+def job_filters(
+    min_payoff: float | None = Query(None, ge=0, description="Lowest payoff, inclusive"),
+    max_payoff: float | None = Query(None, ge=0, description="Highest payoff, inclusive"),
+    company_id: list[int] = Query([], description="Only jobs of these companies (repeatable)"),
+    tag_id: list[int] = Query([], description="Only jobs with any of these tags (repeatable)"),
+    posted_since: datetime | None = Query(None, description="Only jobs posted at or after this time"),
+    exclude_expired: bool = Query(False, description="Skip jobs whose expiry date has passed"),
+) -> JobFilters:
+    if min_payoff is not None and max_payoff is not None and min_payoff > max_payoff:
+        raise HTTPException(status_code=400, detail="INVALID_PAYOFF_RANGE")
+
+    return JobFilters(
+        min_payoff=min_payoff,
+        max_payoff=max_payoff,
+        company_ids=tuple(sorted(set(company_id))),
+        tag_ids=tuple(sorted(set(tag_id))),
+        posted_since=posted_since,
+        exclude_expired=exclude_expired,
+    )
@@ -1,10 +1,13 @@
 from fastapi import HTTPException, status
+from sqlalchemy import Integer, String, and_, delete, func, literal, null, select, union_all
 from sqlalchemy.orm import Session
 
-from database import db_session_scope
-from database.models import Job, Account
+from database import async_db_session_scope, db_session_scope
+from database.models import Job, Account, JobApplicant, Company, EntityTag, Tag
 from database.schemas.job_schema import JobSchemaPOST
 from core.services.queries_service.base_queries import BaseQueries
+from core.services.queries_service.job_filters import JobFilters
+from core.services.cache_service.query_cache import query_cache, model_tag
 
 class JobQueries(BaseQueries):
 
@@ -39,7 +42,63 @@ class JobQueries(BaseQueries):
                 session.refresh(new_job)
                 
                 session.expunge(new_job) 
-                return new_job
+
+            query_cache.invalidate_model(self.model)
+            return new_job
                 
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
+
+    def get_company_ids(self, ids: list[int]) -> dict[int, int]:
+        """Map job id -> company_id for the given ids in one query (unknown ids are left out)."""
+        with db_session_scope(commit=False) as session:
+            rows = session.query(Job.id, Job.company_id).filter(Job.id.in_(set(ids))).all()
+        return dict(rows)
+
+    async def async_get_facets(self, filters: JobFilters) -> dict:
+        """Job counts per tag and per company (and in total) for the jobs matching `filters`."""
+        return await self._cached_async(
+            ("facets", filters),
+            [model_tag(Job), model_tag(Tag), model_tag(Company)],
+            lambda: self._async_load_facets(filters),
+        )
+
+    async def _async_load_facets(self, filters: JobFilters) -> dict:
+        async with async_db_session_scope(commit=False) as session:
+            rows = (await session.execute(self._facets_query(filters))).all()
+
+        facets = {"total": 0, "tags": [], "companies": []}
+        for facet, id, name, count in rows:
+            if facet == "total":
+                facets["total"] = count
+            else:
+                facets[facet].append({"id": id, "name": name, "count": count})
+
+        for facet in ("tags", "companies"):
+            facets[facet].sort(key=lambda item: (-item["count"], item["id"]))
+        return facets
+
+    @staticmethod
+    def _facets_query(filters: JobFilters):
+        # All facets in one round trip: the filtered job ids once (CTE), one aggregate branch per facet
+        filtered = select(Job.id, Job.company_id).where(*filters.clauses()).cte("filtered")
+
+        tags = (
+            select(literal("tags").label("facet"), Tag.id, Tag.name, func.count(filtered.c.id.distinct()))
+            .select_from(filtered)
+            .join(EntityTag, and_(EntityTag.entity_type == "job", EntityTag.entity_id == filtered.c.id))
+            .join(Tag, Tag.id == EntityTag.tag_id)
+            .group_by(Tag.id, Tag.name)
+        )
+        companies = (
+            select(literal("companies"), Company.id, Company.name, func.count())
+            .select_from(filtered)
+            .join(Company, Company.id == filtered.c.company_id)
+            .group_by(Company.id, Company.name)
+        )
+        total = select(literal("total"), null().cast(Integer), null().cast(String), func.count()).select_from(filtered)
+        return union_all(tags, companies, total)
+
+    def _before_bulk_delete(self, session, ids: list[int]) -> None:
+        # Job.job_applicants is an ORM-level cascade, which a Core DELETE does not run
+        session.execute(delete(JobApplicant).where(JobApplicant.job_id.in_(ids)))
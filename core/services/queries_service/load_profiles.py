@@ -0,0 +1,65 @@
+"""Named eager-loading profiles.
+
+Objects leave `db_session_scope` detached, so a relationship that was not loaded
+inside the session either triggers one lazy query per row or raises
+DetachedInstanceError. A profile names the relationships an endpoint needs and
+how to load them:
+
+- `joinedload` for many-to-one / one-to-one (same query, one extra JOIN),
+- `selectinload` for collections (one extra `IN (...)` query per relationship,
+  regardless of how many parent rows were loaded).
+
+Select one with `BaseQueries(model, profile=...)` or per call with `profile=`.
+"""
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from database.models import Account, Company, CompanyRecruiter, EntityTag, Job, User, UserSkill
+
+LOAD_PROFILES = {
+    Job: {
+        "job_with_company": (
+            joinedload(Job.company),
+        ),
+        "job_with_company_and_tags": (
+            joinedload(Job.company),
+            selectinload(Job.entity_tags).joinedload(EntityTag.tag),
+        ),
+    },
+    Company: {
+        "company_with_jobs": (
+            selectinload(Company.jobs),
+        ),
+        "company_with_recruiters": (
+            selectinload(Company.recruiters).joinedload(CompanyRecruiter.account),
+        ),
+    },
+    Account: {
+        # Authenticated principal: everything authorization checks read from it
+        "account_with_companies": (
+            joinedload(Account.admin_company),
+            selectinload(Account.company_recruiters),
+        ),
+        "account_me": (
+            joinedload(Account.user),
+            joinedload(Account.admin_company),
+        ),
+    },
+    User: {
+        "user_with_profile": (
+            selectinload(User.work_experiences),
+            selectinload(User.educations),
+            selectinload(User.skills).joinedload(UserSkill.tag),
+        ),
+    },
+}
+
+
+def load_options(model, profile: str | None) -> tuple:
+    """Loader options of `profile` for `model`; no profile means lazy defaults."""
+    if profile is None:
+        return ()
+    try:
+        return LOAD_PROFILES[model][profile]
+    except KeyError:
+        raise ValueError(f"Unknown load profile '{profile}' for {model.__name__}") from None
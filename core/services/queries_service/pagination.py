@@ -0,0 +1,119 @@
+"""Keyset (cursor) pagination helpers shared by the list endpoints.
+
+Pages are ordered by a sort column plus `id` as a tie-breaker, and the next
+page starts strictly after the last row of the previous one, so the cost of a
+page does not grow with its position in the table (no OFFSET scans).
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import AsyncIterator, Iterable, Iterator
+
+from fastapi import HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from core.services.http_service.fast_json import encode_trusted
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 500
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int
+    cursor: str | None
+    sort: str
+    stream: bool
+
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description=f"Opaque cursor taken from the {NEXT_CURSOR_HEADER} header"),
+    sort: str = Query("id", description="Sort column, prefix with '-' for descending order"),
+    stream: bool = Query(False, description="Stream all rows as NDJSON instead of returning one page"),
+) -> PageParams:
+    return PageParams(limit=limit, cursor=cursor, sort=sort, stream=stream)
+
+
+def parse_sort(sort: str, sortable: tuple[str, ...]) -> tuple[str, bool]:
+    """Split `-posting_date` into ("posting_date", descending=True)."""
+    descending = sort.startswith("-")
+    column = sort.lstrip("-")
+    if column not in sortable:
+        raise HTTPException(status_code=400, detail="INVALID_SORT")
+    return column, descending
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(value, python_type):
+    if value is None:
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(sort: str, values: Iterable) -> str:
+    payload = json.dumps({"s": sort, "v": [_encode_value(v) for v in values]})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: str, columns: list) -> tuple:
+    """Decode a cursor produced by `encode_cursor` for the same sort order."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if payload["s"] != sort or len(payload["v"]) != len(columns):
+            raise ValueError("cursor does not match sort order")
+        return tuple(
+            _decode_value(value, column.type.python_type)
+            for value, column in zip(payload["v"], columns)
+        )
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="INVALID_CURSOR")
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    response.headers.update(next_cursor_headers(next_cursor))
+
+
+def next_cursor_headers(next_cursor: str | None) -> dict:
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+
+
+def ndjson_response(rows: Iterator | AsyncIterator, schema: type[BaseModel], trusted: bool = False) -> StreamingResponse:
+    """Serialize rows one by one so memory does not depend on the row count.
+
+    `trusted` rows (projected) skip validation, see fast_json.py.
+    """
+
+    def line(row) -> bytes:
+        body = encode_trusted(schema, row) if trusted else None
+        if body is None:
+            body = schema.model_validate(row).model_dump_json().encode()
+        return body + b"\n"
+
+    def lines():
+        for row in rows:
+            yield line(row)
+
+    async def async_lines():
+        async for row in rows:
+            yield line(row)
+
+    body = async_lines() if hasattr(rows, "__aiter__") else lines()
+    return StreamingResponse(body, media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,26 @@
+"""Column projection for read paths.
+
+A service created with `BaseQueries(model, schema=...)` selects only the columns
+the response schema declares and returns SQLAlchemy `Row` objects instead of ORM
+instances: no identity map, no instance state, no unused column values. Rows
+support attribute access, so schemas with `from_attributes=True` validate them
+the same way they validate entities.
+
+Only plain column fields can be projected; schemas that embed relationships keep
+using load profiles (see load_profiles.py).
+"""
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+
+
+def projected_columns(model, schema: type[BaseModel], extra: tuple[str, ...] = ()) -> tuple:
+    """Mapped columns of `model` for every field of `schema`, plus `extra` keys (e.g. sort columns)."""
+    column_attrs = {attr.key for attr in inspect(model).column_attrs}
+
+    keys = list(dict.fromkeys([*schema.model_fields, *extra]))
+    missing = [key for key in keys if key not in column_attrs]
+    if missing:
+        raise ValueError(f"{schema.__name__} fields {missing} are not columns of {model.__name__}")
+
+    return tuple(getattr(model, key) for key in keys)
@@ -1,39 +1,140 @@
-from sqlalchemy import or_
-from database.models import User, Job, Company
-from database.database import get_db_session
+import asyncio
+import logging
+import os
+
+from fastapi import HTTPException
+from sqlalchemy import func, literal, or_, select, text
+from sqlalchemy.exc import DBAPIError
+
+from database import async_db_session_scope
+from database import MissingDatabaseError
+from database.models import User, Job, Company, JOB_SEARCH_DOCUMENT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULTS_PER_CATEGORY = 10
+SEARCH_QUERY_TIMEOUT_MS = int(os.getenv("SEARCH_QUERY_TIMEOUT_MS", "2000"))
+
+# Postgres SQLSTATE raised when statement_timeout cancels a query
+QUERY_CANCELED = "57014"
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
 
 
 class SearchQueries:
-    def __init__(self):
-        self.db = get_db_session()
+    """Ranked people/jobs/companies search backed by pg_trgm and full-text indexes.
 
-    def global_search(self, query: str):
-        search_filter = f"{query}%"
+    Every category matches on a case-insensitive prefix (ILIKE 'q%') or on
+    trigram word similarity (`q <% column`, typo tolerant); jobs additionally
+    match the full-text document of title + description. Both predicates are
+    served by the GIN indexes declared in `database/models.py`.
 
-        # Ludzie
-        people = self.db.query(User).filter(
-            or_(
-                User.first_name.ilike(search_filter),
-                User.last_name.ilike(search_filter)
-            )
-        ).all()
+    Categories run concurrently, each on its own short-lived async session
+    (AsyncSession is not safe for concurrent use), and each is bounded by
+    SEARCH_QUERY_TIMEOUT_MS. A category that times out comes back empty and
+    is listed in `timed_out` instead of failing the whole search.
+    """
 
-        # Oferty pracy
-        jobs = self.db.query(Job).filter(
-            or_(
-                Job.title.ilike(search_filter)
-            )
-        ).all()
+    def __init__(self, timeout_ms: int = SEARCH_QUERY_TIMEOUT_MS):
+        self.timeout_ms = timeout_ms
 
-        # Firmy
-        companies = self.db.query(Company).filter(
-            or_(
-                Company.name.ilike(search_filter)
+    async def global_search(self, query: str, limit: int = DEFAULT_RESULTS_PER_CATEGORY):
+        statements = {
+            "people": self._people_query(query, limit),
+            "jobs": self._jobs_query(query, limit),
+            "companies": self._companies_query(query, limit),
+        }
+        rows = await asyncio.gather(
+            *(self._run_category(category, statement) for category, statement in statements.items())
+        )
+
+        results = {"timed_out": []}
+        for category, category_rows in zip(statements, rows):
+            if category_rows is None:
+                results["timed_out"].append(category)
+                category_rows = []
+            results[category] = [
+                {"id": row.id, **row.payload, "score": round(row.score, 4)} for row in category_rows
+            ]
+        return results
+
+    async def _run_category(self, category: str, statement):
+        try:
+            # Client-side bound also covers waiting for a pooled connection
+            return await asyncio.wait_for(self._execute(statement), timeout=self.timeout_ms / 1000 + 0.5)
+        except asyncio.TimeoutError:
+            logger.warning(f"Search category '{category}' timed out")
+            return None
+        except DBAPIError as e:
+            if getattr(e.orig, "pgcode", None) != QUERY_CANCELED:
+                raise
+            logger.warning(f"Search category '{category}' hit statement_timeout")
+            return None
+        except MissingDatabaseError:
+            logger.error("Database for provided object does not exist")
+            raise HTTPException(404)
+
+    async def _execute(self, statement):
+        async with async_db_session_scope(commit=False) as session:
+            # SET LOCAL only lasts for this transaction, the pooled connection keeps its default
+            await session.execute(text(f"SET LOCAL statement_timeout = {int(self.timeout_ms)}"))
+            return (await session.execute(statement)).all()
+
+    @staticmethod
+    def _matches(column, query: str):
+        prefix = f"{_escape_like(query)}%"
+        return or_(
+            column.ilike(prefix, escape="/"),
+            literal(query).op("<%")(column),
+        )
+
+    @staticmethod
+    def _ranked(id_column, payload, score, where, limit: int):
+        return (
+            select(
+                id_column.label("id"),
+                payload.label("payload"),
+                score.label("score"),
             )
-        ).all()
+            .where(where)
+            .order_by(score.desc(), id_column)
+            .limit(limit)
+        )
 
-        return {
-            "people": people,
-            "jobs": jobs,
-            "companies": companies
-        }
+    def _people_query(self, query: str, limit: int):
+        score = func.greatest(
+            func.word_similarity(query, User.first_name),
+            func.word_similarity(query, User.last_name),
+        )
+        payload = func.jsonb_build_object(
+            text("'first_name'"), User.first_name,
+            text("'last_name'"), User.last_name,
+            text("'profile_img_link'"), User.profile_img_link,
+        )
+        where = or_(self._matches(User.first_name, query), self._matches(User.last_name, query))
+        return self._ranked(User.id, payload, score, where, limit)
+
+    def _jobs_query(self, query: str, limit: int):
+        ts_query = func.websearch_to_tsquery(text("'simple'"), query)
+        score = func.greatest(
+            func.word_similarity(query, Job.title),
+            func.ts_rank(JOB_SEARCH_DOCUMENT, ts_query),
+        )
+        payload = func.jsonb_build_object(
+            text("'company_id'"), Job.company_id,
+            text("'title'"), Job.title,
+            text("'payoff'"), Job.payoff,
+            text("'posting_img_link'"), Job.posting_img_link,
+        )
+        where = or_(self._matches(Job.title, query), JOB_SEARCH_DOCUMENT.op("@@")(ts_query))
+        return self._ranked(Job.id, payload, score, where, limit)
+
+    def _companies_query(self, query: str, limit: int):
+        score = func.word_similarity(query, Company.name)
+        payload = func.jsonb_build_object(
+            text("'name'"), Company.name,
+            text("'profile_img_link'"), Company.profile_img_link,
+        )
+        return self._ranked(Company.id, payload, score, self._matches(Company.name, query), limit)
@@ -0,0 +1,25 @@
+from sqlalchemy import delete
+
+from database.models import EntityTag, Job, UserSkill
+from core.services.queries_service.base_queries import BaseQueries
+from core.services.queries_service.bulk import BULK_BATCH_SIZE, BulkResult
+from core.services.cache_service.query_cache import query_cache
+
+
+class TagQueries(BaseQueries):
+
+    def delete_record(self, id: int):
+        deleted = super().delete_record(id)
+        # Tag-filtered job pages change with the removed tag assignments
+        query_cache.invalidate_model(Job)
+        return deleted
+
+    def bulk_delete(self, items: list[tuple[int, int]], result: BulkResult, batch_size: int = BULK_BATCH_SIZE):
+        super().bulk_delete(items, result, batch_size)
+        if result.succeeded_ids():
+            query_cache.invalidate_model(Job)
+
+    def _before_bulk_delete(self, session, ids: list[int]) -> None:
+        # Tag.user_skills and Tag.entity_tags are ORM-level cascades, which a Core DELETE does not run
+        session.execute(delete(UserSkill).where(UserSkill.tag_id.in_(ids)))
+        session.execute(delete(EntityTag).where(EntityTag.tag_id.in_(ids)))
@@ -6,6 +6,7 @@ from fastapi import HTTPException
 from database.schemas.company_rating_schema import RatingCreate
 from database.schemas.company_rating_schema import RatingResponse
 from core.services.queries_service.company_rating_queries import CompanyRatingQueriesService
+from core.services.rating_service.rating_buffer import rating_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,9 @@ class RatingService:
 
         user = self.queries.get_user_by_account_id(current_account.id)
 
+        if rating_buffer.enabled:
+            return self._buffered_rating(company_id, user.id, rating_data.score)
+
         result = self.queries.upsert_rating_entry(
             company_id=company_id,
             user_id=user.id,
@@ -32,10 +36,28 @@ class RatingService:
 
         return result
 
+    def _buffered_rating(self, company_id: int, user_id: int, score: int):
+        row = self.queries.upsert_rating_row(company_id, user_id, score)
+        pending_sum, pending_count = rating_buffer.add(company_id, row.sum_delta, row.count_delta)
+
+        # Stored aggregates plus what is still buffered: an estimate until the next flush
+        ratings_sum = row.ratings_sum + pending_sum
+        ratings_count = row.ratings_count + pending_count
+        return {
+            "company_id": company_id,
+            "rating": round(ratings_sum / ratings_count, 2) if ratings_count else 0.0,
+            "ratings_count": ratings_count
+        }
+
     def remove_rating(self, company_id: int, current_account):
         if current_account.type != "applicant":
             raise HTTPException(status_code=403, detail="Forbidden")
 
         user = self.queries.get_user_by_account_id(current_account.id)
 
+        if rating_buffer.enabled:
+            score = self.queries.delete_rating_row(company_id, user.id)
+            rating_buffer.add(company_id, -score, -1)
+            return {"message": "Rating deleted successfully"}
+
         return self.queries.delete_raing_entry(company_id, user.id)
@@ -0,0 +1,130 @@
+"""Write-behind buffer for company rating aggregates.
+
+In buffered mode a vote (or its deletion) writes its `company_rating` row right
+away, but the change to `company.ratings_sum` / `ratings_count` is coalesced in
+memory per company and applied by a background thread in one batched UPDATE every
+RATING_FLUSH_INTERVAL_MS, so a burst of votes on one company becomes a single
+row update per interval instead of one per vote.
+
+Rating rows are the source of truth: if a flush cannot be written on shutdown,
+the aggregates are recomputed from `company_rating` instead. While the buffer
+holds deltas, ad-hoc reconciliation of the same companies would count them twice.
+"""
+
+import logging
+import os
+import threading
+
+from core.services.queries_service.company_rating_queries import CompanyRatingQueriesService
+
+logger = logging.getLogger(__name__)
+
+RATING_BUFFER_ENABLED = os.getenv("RATING_BUFFER_ENABLED", "false").strip().lower() in ("1", "true", "yes", "on")
+RATING_FLUSH_INTERVAL_MS = int(os.getenv("RATING_FLUSH_INTERVAL_MS", "500"))
+
+
+class RatingBuffer:
+
+    def __init__(self, flush_interval_ms: int, enabled: bool = True):
+        self.flush_interval = flush_interval_ms / 1000
+        self.enabled = enabled
+        self.queries = CompanyRatingQueriesService()
+        self.flushes = 0
+        self.failed_flushes = 0
+
+        self._lock = threading.Lock()
+        self._pending: dict[int, list[int]] = {}
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def add(self, company_id: int, sum_delta: int, count_delta: int) -> tuple[int, int]:
+        """Queue a delta; returns the company's pending (sum, count) including it."""
+        with self._lock:
+            pending = self._pending.setdefault(company_id, [0, 0])
+            pending[0] += sum_delta
+            pending[1] += count_delta
+            return pending[0], pending[1]
+
+    def flush(self) -> int:
+        """Apply everything queued so far; returns how many companies were updated."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+
+        batch = {company_id: tuple(delta) for company_id, delta in batch.items() if any(delta)}
+        if not batch:
+            return 0
+
+        try:
+            self.queries.apply_rating_deltas(batch)
+        except Exception:
+            self.failed_flushes += 1
+            self._requeue(batch)
+            raise
+        self.flushes += 1
+        return len(batch)
+
+    def _requeue(self, batch: dict[int, tuple[int, int]]) -> None:
+        for company_id, (sum_delta, count_delta) in batch.items():
+            self.add(company_id, sum_delta, count_delta)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "enabled": self.enabled,
+            "flush_interval_ms": int(self.flush_interval * 1000),
+            "pending_companies": pending,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+        }
+
+    # =====================
+    # Background flusher
+    # =====================
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="rating-buffer-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and write out what is left, falling back to reconciliation."""
+        if self._thread is not None:
+            self._stopping = True
+            self._wake.set()
+            self._thread.join(timeout=max(self.flush_interval * 2, 5))
+            self._thread = None
+
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Final rating flush failed, reconciling from company_rating: {e}")
+            with self._lock:
+                company_ids = list(self._pending)
+            try:
+                for company_id in company_ids:
+                    self.queries.reconcile_rating_aggregates(company_id)
+                with self._lock:
+                    self._pending.clear()
+            except Exception as e:
+                logger.error(
+                    f"Rating reconciliation failed for companies {company_ids}; "
+                    f"run `python -m core.services.rating_service.reconcile_ratings`: {e}"
+                )
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stopping:
+                return
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Rating flush failed, will retry: {e}")
+
+
+rating_buffer = RatingBuffer(flush_interval_ms=RATING_FLUSH_INTERVAL_MS, enabled=RATING_BUFFER_ENABLED)
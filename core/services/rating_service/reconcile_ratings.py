@@ -0,0 +1,19 @@
+"""Recompute company rating aggregates from `company_rating`.
+
+    python -m core.services.rating_service.reconcile_ratings [company_id]
+"""
+
+import sys
+
+from core.services.queries_service.company_rating_queries import CompanyRatingQueriesService
+
+
+def main(argv: list[str]) -> int:
+    company_id = int(argv[0]) if argv else None
+    fixed = CompanyRatingQueriesService().reconcile_rating_aggregates(company_id)
+    print(f"Reconciled {len(fixed)} companies: {fixed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
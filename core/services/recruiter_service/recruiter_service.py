@@ -3,17 +3,24 @@ from fastapi import HTTPException
 from sqlalchemy.sql import exists
 from database import db_session_scope
 from database.models import Account, Company, CompanyRecruiter
+from core.services.auth_service.principal_cache import principal_cache
+from core.services.queries_service.load_profiles import load_options
 logger = logging.getLogger(__name__)
 
 
 class RecruiterService:
-    def _assert_admin_and_company_match(self, current_account: Account, company_id: int) -> Company:
+    def _assert_admin_and_company_match(self, current_account: Account, company_id: int, profile: str | None = None) -> Company:
         # 1) Admin check
         if (current_account.type or "").lower() != "admin":
             raise HTTPException(status_code=403, detail="FORBIDDEN")
 
         with db_session_scope(commit=False) as session:
-            company = session.query(Company).filter(Company.id == company_id).first()
+            company = (
+                session.query(Company)
+                .options(*load_options(Company, profile))
+                .filter(Company.id == company_id)
+                .first()
+            )
             if not company:
                 raise HTTPException(status_code=404, detail="COMPANY_NOT_FOUND")
 
@@ -53,21 +60,17 @@ class RecruiterService:
 
             link = CompanyRecruiter(account_id=user_account_id, company_id=company_id)
             session.add(link)
-            return {"status": "ok", "detail": "ASSIGNED", "company_id": company_id, "account_id": user_account_id}
 
-    def list_company_users(self, company_id: int, current_account: Account) -> list[Account]:
-        self._assert_admin_and_company_match(current_account, company_id)
+        principal_cache.invalidate_account(user_account_id)
+        return {"status": "ok", "detail": "ASSIGNED", "company_id": company_id, "account_id": user_account_id}
 
-        with db_session_scope(commit=False) as session:
-            return (
-                session.query(Account)
-                .join(CompanyRecruiter, CompanyRecruiter.account_id == Account.id)
-                .filter(
-                    CompanyRecruiter.company_id == company_id,
-                    Account.type == "applicant",
-                )
-                .all()
-            )
+    def list_company_users(self, company_id: int, current_account: Account) -> list[Account]:
+        company = self._assert_admin_and_company_match(current_account, company_id, profile="company_with_recruiters")
+        return [
+            recruiter.account
+            for recruiter in company.recruiters
+            if recruiter.account.type == "applicant"
+        ]
 
     def remove_user_from_company_recruiters(self, company_id: int, user_account_id: int, current_account: Account) -> dict:
         self._assert_admin_and_company_match(current_account, company_id)
@@ -85,4 +88,6 @@ class RecruiterService:
                 raise HTTPException(status_code=404, detail="ASSIGNMENT_NOT_FOUND")
 
             session.delete(link)
-            return {"status": "ok", "detail": "REMOVED", "company_id": company_id, "account_id": user_account_id}
+
+        principal_cache.invalidate_account(user_account_id)
+        return {"status": "ok", "detail": "REMOVED", "company_id": company_id, "account_id": user_account_id}
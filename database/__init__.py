@@ -1,11 +1,11 @@
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 
 from database import database
 
 
 @contextmanager
 def db_session_scope(commit: bool = False):
-    if not database.is_database_exist():
+    if not database.health.is_available:
         raise MissingDatabaseError
     session = database.get_db_session()
     try:
@@ -20,6 +20,23 @@ def db_session_scope(commit: bool = False):
         session.close()
 
 
+@asynccontextmanager
+async def async_db_session_scope(commit: bool = False):
+    if not database.health.is_available:
+        raise MissingDatabaseError
+    session = database.get_async_db_session()
+    try:
+        yield session
+
+        if commit:
+            await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
 class MissingDatabaseError(Exception):
     """Database does not exist"""
     pass
@@ -4,12 +4,18 @@ import sys
 from dotenv import load_dotenv
 
 from sqlalchemy import inspect
+from sqlalchemy import text
 from sqlalchemy import create_engine
 
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy_utils import database_exists
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 from database.models import Base
+from database.health import DatabaseHealth
+from database.pool import InstrumentedAsyncQueuePool
+from database.pool import InstrumentedQueuePool
+from database.pool import PoolSettings
+from database.pool import pool_metrics
 from core.services.debug_service.logger_config import get_logger
 
 logger = get_logger(__name__)
@@ -22,12 +28,46 @@ POSTGRES_SERVER = os.getenv("DB_HOST")
 POSTGRES_PORT = os.getenv("DB_PORT")
 POSTGRES_DB = os.getenv("DB_NAME")
 
+DB_HEALTH_PROBE_INTERVAL = float(os.getenv("DB_HEALTH_PROBE_INTERVAL", "15"))
+
+# Extensions the schema depends on (trigram search indexes)
+REQUIRED_EXTENSIONS = ("pg_trgm",)
+
+# Columns made NOT NULL after their table existed: (table, column, value for existing NULLs)
+NOT_NULL_BACKFILLS = (
+    ("job", "posting_date", "now()"),
+)
+
 DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
-engine = create_engine(DATABASE_URL)
+POOL_SETTINGS = PoolSettings.from_env()
+
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    connect_args=POOL_SETTINGS.psycopg2_connect_args(),
+    **POOL_SETTINGS.engine_kwargs(),
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async counterpart used by read-heavy endpoints so queries do not block the event loop.
+# expire_on_commit=False: objects are returned after the scope ends and must not trigger lazy IO.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=InstrumentedAsyncQueuePool,
+    connect_args=POOL_SETTINGS.asyncpg_connect_args(),
+    **POOL_SETTINGS.engine_kwargs(),
+)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Availability is cached here instead of probing the server on every session open.
+health = DatabaseHealth(probe_interval=DB_HEALTH_PROBE_INTERVAL)
+health.attach(engine)
+health.attach(async_engine.sync_engine)
+
 
 def get_db():
     db = SessionLocal()
@@ -37,50 +77,101 @@ def get_db():
         db.close()
 
 
-def is_database_exist():
-    return database_exists(DATABASE_URL)
+def get_async_db_session():
+    return AsyncSessionLocal()
 
 
 def get_db_session():
-    session_maker = sessionmaker(
-        autocommit=False, autoflush=False, bind=engine
-    )
-    return session_maker()
+    return SessionLocal()
+
+
+def get_pool_metrics():
+    return {
+        "sync": pool_metrics(engine.pool),
+        "async": pool_metrics(async_engine.sync_engine.pool),
+    }
+
+
+def ensure_extensions():
+    for extension in REQUIRED_EXTENSIONS:
+        try:
+            with engine.begin() as connection:
+                connection.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+        except Exception as e:
+            logger.error(f"Could not enable extension {extension}: {e}")
+
+
+def ensure_indexes(existing_tables: set):
+    """create_all() only adds indexes together with new tables; add the ones declared later."""
+    # One catalog query instead of a per-index existence check
+    with engine.connect() as connection:
+        existing_indexes = set(connection.execute(
+            text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+        ).scalars())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            try:
+                index.create(bind=engine)
+            except Exception as e:
+                logger.error(f"Could not create index {index.name}: {e}")
+
+
+def ensure_not_null_columns(existing_tables: set):
+    """create_all() does not alter existing columns; backfill and tighten the ones made NOT NULL later."""
+    with engine.connect() as connection:
+        nullable = set(connection.execute(text(
+            "SELECT table_name, column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND is_nullable = 'YES'"
+        )).tuples())
+
+    for table, column, backfill in NOT_NULL_BACKFILLS:
+        if table not in existing_tables or (table, column) not in nullable:
+            continue
+        try:
+            with engine.begin() as connection:
+                connection.execute(text(f'UPDATE "{table}" SET {column} = {backfill} WHERE {column} IS NULL'))
+                connection.execute(text(f'ALTER TABLE "{table}" ALTER COLUMN {column} SET NOT NULL'))
+            logger.info(f"Made {table}.{column} NOT NULL")
+        except Exception as e:
+            logger.error(f"Could not make {table}.{column} NOT NULL: {e}")
 
 
 def init_db():
     logger.info(f"Connecting to: {POSTGRES_DB} on {POSTGRES_SERVER}...")
 
     try:
-        if is_database_exist() is False:
+        if health.check_exists(DATABASE_URL) is False:
             logger.error("Can not connect to database")
             return False
         logger.info("Database connection OK.")
+        ensure_extensions()
 
-        inspector = inspect(engine)
-        existing_tables = set(inspector.get_table_names())
+        existing_tables = set(inspect(engine).get_table_names())
 
         expected_tables = set(Base.metadata.tables.keys())
         missing_tables = expected_tables - existing_tables
 
+        ensure_indexes(existing_tables & expected_tables)
+        ensure_not_null_columns(existing_tables & expected_tables)
+
         if not missing_tables:
             logger.info("All expected tables already exist in the database.")
             logger.info(f"Existing tables: {sorted(existing_tables)}")
             return True
 
         logger.info(f"Missing tables detected, creating: {sorted(missing_tables)}")
-        Base.metadata.create_all(bind=engine)
+        # Only the missing tables; create_all() raises if any of them cannot be created
+        Base.metadata.create_all(
+            bind=engine,
+            tables=[Base.metadata.tables[name] for name in missing_tables],
+        )
         logger.info(f"Created: {sorted(missing_tables)}")
-
-        inspector_after = inspect(engine)
-        existing_after = set(inspector_after.get_table_names())
-        still_missing = expected_tables - existing_after
-
-        if still_missing:
-            logger.error(f"Some tables could NOT be created: {sorted(still_missing)}")
-            return False
-
-        logger.info(f"All tables in database: {sorted(existing_after)}")
+        logger.info(f"All tables in database: {sorted(existing_tables | missing_tables)}")
         return True
 
     except Exception as e:
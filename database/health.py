@@ -0,0 +1,133 @@
+"""Cached database availability state.
+
+Existence of the database is checked once by `init_db`. After that the state is
+kept up to date by pool events and a background probe thread, so opening a
+session only reads a flag instead of querying `pg_database` on every request.
+"""
+
+import threading
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from core.services.debug_service.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class DatabaseHealth:
+
+    def __init__(self, probe_interval: float):
+        self.probe_interval = probe_interval
+        # None = not checked yet; sessions are allowed and fail on their own if the DB is down
+        self._available: bool | None = None
+        self._last_error: str | None = None
+        self._checked_at: float | None = None
+
+        self._engine: Engine | None = None
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_available(self) -> bool:
+        return self._available is not False
+
+    def snapshot(self) -> dict:
+        return {
+            "available": self._available,
+            "last_error": self._last_error,
+            "checked_at": self._checked_at,
+        }
+
+    def mark_available(self) -> None:
+        if self._available is False:
+            logger.info("Database is reachable again.")
+        self._available = True
+        self._last_error = None
+        self._checked_at = time.time()
+
+    def mark_unavailable(self, reason: str) -> None:
+        if self._available is not False:
+            logger.error(f"Database marked as unavailable: {reason}")
+        self._available = False
+        self._last_error = reason
+        self._checked_at = time.time()
+
+    def check_exists(self, url: str) -> bool:
+        """One-off existence check, used at startup."""
+        # sqlalchemy_utils is heavy to import and only needed here
+        from sqlalchemy_utils import database_exists
+
+        try:
+            exists = database_exists(url)
+        except Exception as e:
+            self.mark_unavailable(str(e))
+            return False
+
+        if exists:
+            self.mark_available()
+        else:
+            self.mark_unavailable("Database does not exist")
+        return exists
+
+    def probe(self) -> bool:
+        try:
+            with self._engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except Exception as e:
+            self.mark_unavailable(str(e))
+            return False
+
+        self.mark_available()
+        return True
+
+    def request_probe(self) -> None:
+        """Ask the background thread to re-check now instead of waiting for the next interval."""
+        self._wake.set()
+
+    # =====================
+    # Pool events
+    # =====================
+
+    def attach(self, engine: Engine) -> None:
+        if self._engine is None:
+            self._engine = engine
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            self.mark_available()
+
+        @event.listens_for(engine, "handle_error")
+        def _on_error(context):
+            # A single dropped connection is not an outage; let the probe decide.
+            if context.is_disconnect:
+                self.request_probe()
+
+    # =====================
+    # Background probe
+    # =====================
+
+    def start(self) -> None:
+        if self._thread is not None or self._engine is None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="db-health-probe", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        self._thread.join(timeout=self.probe_interval)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.probe_interval)
+            self._wake.clear()
+            if self._stopping:
+                return
+            self.probe()
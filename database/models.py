@@ -14,7 +14,10 @@ from sqlalchemy import (
     Float,
     CheckConstraint,
     UniqueConstraint,
-    Numeric
+    Numeric,
+    Index,
+    literal_column,
+    text,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship, declarative_base
@@ -63,7 +66,14 @@ class Account(Base):
 
 class User(Base):
     __tablename__ = "user"
-    __table_args__ = {"quote": True}  # ważne dla Postgresa (reserved keyword)
+    __table_args__ = (
+        # Trigram indexes for /search/ (ILIKE prefix + fuzzy matching), need pg_trgm
+        Index("ix_user_first_name_trgm", "first_name", postgresql_using="gin",
+              postgresql_ops={"first_name": "gin_trgm_ops"}),
+        Index("ix_user_last_name_trgm", "last_name", postgresql_using="gin",
+              postgresql_ops={"last_name": "gin_trgm_ops"}),
+        {"quote": True},  # ważne dla Postgresa (reserved keyword)
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -82,6 +92,7 @@ class User(Base):
     description = Column(String(255), nullable=True)
     profile_img_id = Column(Text, nullable=True)
     profile_img_link = Column(Text, nullable=True)
+    profile_img_status = Column(String(20), nullable=True)
 
     account = relationship("Account", back_populates="user")
 
@@ -155,6 +166,10 @@ class Education(Base):
 
 class Company(Base):
     __tablename__ = "company"
+    __table_args__ = (
+        Index("ix_company_name_trgm", "name", postgresql_using="gin",
+              postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -163,6 +178,8 @@ class Company(Base):
     description = Column(Text(), nullable=True)
     rating = Column(Numeric(3, 2), default=0)
     ratings_count = Column(Integer, default=0)
+    # Exact sum of company_rating.score; rating is derived from it, never accumulated
+    ratings_sum = Column(Integer, default=0, server_default="0", nullable=False)
     account_id = Column(
         Integer,
         ForeignKey("account.id", ondelete="RESTRICT"),
@@ -174,6 +191,7 @@ class Company(Base):
 
     profile_img_id = Column(Text, nullable=True)
     profile_img_link = Column(Text, nullable=True)
+    profile_img_status = Column(String(20), nullable=True)
 
     jobs = relationship(
         "Job",
@@ -220,6 +238,15 @@ class CompanyRecruiter(Base):
 
 class Job(Base):
     __tablename__ = "job"
+    __table_args__ = (
+        Index("ix_job_title_trgm", "title", postgresql_using="gin",
+              postgresql_ops={"title": "gin_trgm_ops"}),
+        # Job feed: keyset order by date / payoff (id is the tie-breaker), company filter
+        Index("ix_job_posting_date_id", "posting_date", "id"),
+        Index("ix_job_payoff_id", "payoff", "id"),
+        Index("ix_job_company_posting_date_id", "company_id", "posting_date", "id"),
+        Index("ix_job_expiry_date", "expiry_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     company_id = Column(Integer, ForeignKey("company.id"), nullable=False)
@@ -227,10 +254,12 @@ class Job(Base):
     title = Column(String, nullable=False)
     payoff = Column(Float, nullable=False)
     description = Column(Text, nullable=False)
-    posting_date = Column(DateTime(timezone=True), server_default=func.now())
+    # NOT NULL: keyset pages sort on (posting_date, id), which cannot compare NULLs
+    posting_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     expiry_date = Column(DateTime(timezone=True), nullable=True)
     posting_img_id = Column(Text, nullable=True)
     posting_img_link = Column(Text, nullable=True)
+    posting_img_status = Column(String(20), nullable=True)
 
     company = relationship("Company", back_populates="jobs")
 
@@ -251,6 +280,16 @@ class Job(Base):
     )
 
 
+# Full-text document for job search. Literals are inlined (not bound) so the
+# query expression matches the index expression and the planner can use it.
+JOB_SEARCH_DOCUMENT = func.to_tsvector(
+    text("'simple'"),
+    Job.title + literal_column("' '") + Job.description,
+)
+
+Index("ix_job_search_document", JOB_SEARCH_DOCUMENT, postgresql_using="gin")
+
+
 class JobApplicant(Base):
     __tablename__ = "job_applicant"
 
@@ -329,6 +368,11 @@ class EntityTag(Base):
     entity_type holds values like: 'job', 'company', 'applicant'
     """
     __tablename__ = "entity_tag"
+    __table_args__ = (
+        # Entities with a tag (feed tag filter) and tags of entities (facets, eager loads)
+        Index("ix_entity_tag_type_tag_entity", "entity_type", "tag_id", "entity_id"),
+        Index("ix_entity_tag_type_entity_tag", "entity_type", "entity_id", "tag_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     entity_id = Column(Integer, nullable=False)
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+class BulkItemResultSchema(BaseModel):
+    index: int
+    id: int | None = None
+    status: int
+    detail: str | None = None
+
+
+class BulkResultSchema(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BulkItemResultSchema]
+
+
+class BulkDeleteSchema(BaseModel):
+    ids: list[int]
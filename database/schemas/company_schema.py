@@ -21,6 +21,7 @@ class CompanySchemaGET(BaseModel):
     description: str | None = None
     profile_img_id: str | None = None
     profile_img_link: str | None = None
+    profile_img_status: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -3,6 +3,9 @@ from datetime import datetime
 from pydantic import BaseModel
 from pydantic import ConfigDict
 
+from database.schemas.company_schema import CompanySchemaGET
+from database.schemas.tag_schema import TagSchemaGET
+
 
 class JobSchemaGET(BaseModel):
     id: int
@@ -14,10 +17,16 @@ class JobSchemaGET(BaseModel):
     expiry_date: datetime | None = None
     posting_img_id: str | None = None
     posting_img_link: str | None = None
+    posting_img_status: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class JobDetailsSchemaGET(JobSchemaGET):
+    company: CompanySchemaGET
+    tags: list[TagSchemaGET] = []
+
+
 class JobSchemaPOST(BaseModel):
     company_id: int
     title: str
@@ -31,3 +40,15 @@ class JobSchemaPUT(BaseModel):
     description: str | None = None
     payoff: float | None = None
     expiry_date: datetime | None = None
+
+
+class JobFacetCountSchema(BaseModel):
+    id: int
+    name: str
+    count: int
+
+
+class JobFacetsSchema(BaseModel):
+    total: int
+    tags: list[JobFacetCountSchema]
+    companies: list[JobFacetCountSchema]
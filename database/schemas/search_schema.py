@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+
+
+class SearchPersonSchema(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    profile_img_link: str | None = None
+    score: float
+
+
+class SearchJobSchema(BaseModel):
+    id: int
+    company_id: int
+    title: str
+    payoff: float
+    posting_img_link: str | None = None
+    score: float
+
+
+class SearchCompanySchema(BaseModel):
+    id: int
+    name: str
+    profile_img_link: str | None = None
+    score: float
+
+
+class SearchResultsSchema(BaseModel):
+    people: list[SearchPersonSchema]
+    jobs: list[SearchJobSchema]
+    companies: list[SearchCompanySchema]
+    # Categories that exceeded the per-query timeout and were returned empty
+    timed_out: list[str] = []
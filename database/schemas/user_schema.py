@@ -2,6 +2,8 @@ from datetime import date
 
 from pydantic import BaseModel, ConfigDict
 
+from database.schemas.tag_schema import TagSchemaGET
+
 
 class UserSchemaGET(BaseModel):
     id: int
@@ -12,10 +14,50 @@ class UserSchemaGET(BaseModel):
     description: str | None = None
     profile_img_id: str | None = None
     profile_img_link: str | None = None
+    profile_img_status: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WorkExperienceSchemaGET(BaseModel):
+    id: int
+    job_title: str
+    company_name: str
+    start_date: date
+    end_date: date | None = None
+    description: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class EducationSchemaGET(BaseModel):
+    id: int
+    school_name: str
+    degree: str | None = None
+    field_of_study: str | None = None
+    start_date: date
+    end_date: date | None = None
+    description: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserSkillSchemaGET(BaseModel):
+    tag: TagSchemaGET
+    name: str
+    desc: str | None = None
+    years_of_experience: int | None = None
+    proficiency: int | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserProfileSchemaGET(UserSchemaGET):
+    work_experiences: list[WorkExperienceSchemaGET] = []
+    educations: list[EducationSchemaGET] = []
+    skills: list[UserSkillSchemaGET] = []
+
+
 class UserSchemaPOST(BaseModel):
     first_name: str
     last_name: str
@@ -1,4 +1,5 @@
 import os
+import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,8 +16,19 @@ from core.api.job_crud import router as job_router
 from core.api.tag_crud import router as tag_router
 from core.api.search_crud import router as search_router
 from core.api.company_rating_crud import router as rating_router
+from core.api.internal_crud import router as internal_router
+from core.api.metrics_crud import router as metrics_router
+from core.api.media_crud import router as media_router
 
 from core.services.debug_service.logger_config import get_logger
+from core.services.queries_service.pagination import NEXT_CURSOR_HEADER
+from core.security.hashing_executor import hashing_executor
+from core.services.rating_service.rating_buffer import rating_buffer
+from core.services.file_service.upload_worker import upload_worker
+from core.services.debug_service.sql_profiler import SQL_PROFILING_ENABLED
+from core.services.debug_service.sql_profiler import SQLProfilingMiddleware
+from core.services.debug_service.sql_profiler import sql_profiler
+from core.services.metrics_service.middleware import MetricsMiddleware
 
 logger = get_logger(__name__)
 
@@ -26,6 +38,7 @@ load_dotenv()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting OpenSpace...")
+    started = time.perf_counter()
     try:
         models.Base
 
@@ -33,24 +46,41 @@ async def lifespan(app: FastAPI):
             if database.init_db() is False:
                 logger.warning(
                     "There are some problems with database. Check connection!")
+            database.health.start()
+        rating_buffer.start()
 
     except Exception as e:
         logger.error(f"Critical error while initializing db! {e}")
         raise e
 
-    logger.info("Successfully started OpenSpace!")
+    logger.info(f"Successfully started OpenSpace in {(time.perf_counter() - started) * 1000:.0f} ms!")
 
     yield
     logger.info("Stopping application...")
+    # Before the health probe and engines go away, so the last deltas can still be written
+    rating_buffer.stop()
+    upload_worker.shutdown()
+    database.health.stop()
+    hashing_executor.shutdown()
+    await database.async_engine.dispose()
 
 app = FastAPI(lifespan=lifespan)
 
+if SQL_PROFILING_ENABLED:
+    sql_profiler.instrument(database.engine)
+    sql_profiler.instrument(database.async_engine.sync_engine)
+    app.add_middleware(SQLProfilingMiddleware)
+
+# Outermost, so latency and status cover every other middleware
+app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allows all origins
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 app.include_router(accounts_router)
@@ -60,6 +90,9 @@ app.include_router(job_router)
 app.include_router(tag_router)
 app.include_router(search_router)
 app.include_router(rating_router)
+app.include_router(internal_router)
+app.include_router(metrics_router)
+app.include_router(media_router)
 
 if __name__ == "__main__":
     uvicorn.run(